@@ -0,0 +1,43 @@
+"""Benchmarks for kim_edn.
+
+Each module is a standalone script, run from the repository root, e.g.::
+
+    $ python -m benchmarks.bench_float_format
+
+"""
+import random
+import timeit
+
+__all__ = ['coordinates_document', 'best_of', 'report']
+
+
+def coordinates_document(natoms=20000, seed=0):
+    """Return a coordinate-heavy KIM property instance."""
+    rng = random.Random(seed)
+    return {
+        "property-id": "tag:staff@noreply.openkim.org,2014-04-15:property/structure-triclinic-crystal-npt",
+        "instance-id": 1,
+        "species": {"source-value": [rng.choice(["Al", "Ni"]) for _ in range(natoms)]},
+        "basis-atom-coordinates": {
+            "source-value": [[rng.random() for _ in range(3)] for _ in range(natoms)],
+        },
+        "cohesive-potential-energy": {
+            "source-value": -rng.random() * 10,
+            "source-unit": "eV",
+        },
+    }
+
+
+def best_of(func, number=1, repeat=5):
+    """Return the best time (in seconds) of one call to ``func``."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(title, rows, header=('case', 'time [ms]', 'size [bytes]')):
+    """Print a table of ``(name, seconds, size)`` rows."""
+    print(title)
+    print(f'{header[0]:<40} {header[1]:>12} {header[2]:>14}')
+    for name, seconds, size in rows:
+        size = '' if size is None else f'{size:>14,}'
+        print(f'{name:<40} {seconds * 1e3:>12.2f} {size:>14}')
+    print()
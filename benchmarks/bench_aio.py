@@ -0,0 +1,74 @@
+"""``aload`` of a stream against reading the body and calling ``loads``,
+and ``aloads`` with the different executors.
+
+Besides the time, the longest stall of the event loop is measured by a
+task which wakes up every millisecond.
+"""
+import asyncio
+import time
+import tracemalloc
+
+import kim_edn
+
+from benchmarks import coordinates_document, report
+
+
+async def ticker(stalls):
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        stalls.append(now - last)
+        last = now
+
+
+async def stalls_of(coro):
+    stalls = []
+    task = asyncio.ensure_future(ticker(stalls))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.01)
+    task.cancel()
+    return elapsed, max(stalls)
+
+
+async def run(data, func):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await stalls_of(func(reader))
+
+
+async def read_and_loads(reader):
+    return kim_edn.loads(await reader.read())
+
+
+def main():
+    data = kim_edn.dumpb(coordinates_document())
+    rows = []
+    for name, func in (('read() and loads', read_and_loads),
+                       ('aload', kim_edn.aload)):
+        tracemalloc.start()
+        elapsed, stall = asyncio.run(run(data, func))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        elapsed, stall = asyncio.run(run(data, func))
+        rows.append((f'{name}, longest stall {stall * 1e3:.1f} ms', elapsed, peak))
+
+    report(f'Decoding a stream of {len(data):,} bytes', rows,
+           header=('case', 'time [ms]', 'peak [bytes]'))
+
+    rows = []
+    for executor in (None, 'thread', 'process'):
+        # The first call starts the pool
+        asyncio.run(kim_edn.aloads(data, executor=executor))
+        elapsed, stall = asyncio.run(stalls_of(kim_edn.aloads(data, executor=executor)))
+        rows.append((f'executor={executor}, longest stall {stall * 1e3:.1f} ms', elapsed, None))
+
+    report(f'aloads of {len(data):,} bytes', rows)
+
+
+if __name__ == '__main__':
+    main()
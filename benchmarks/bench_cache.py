@@ -0,0 +1,32 @@
+"""``load`` of the same file, without and with a ``DocumentCache`` or ``DiskCache``."""
+import os
+import tempfile
+
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+
+DEFINITION = 'tests/fixtures/atomic-mass-commented.edn'
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        large = os.path.join(tmpdir, 'coordinates.edn')
+        kim_edn.dump(coordinates_document(), large)
+
+        for title, path in (('property definition', DEFINITION),
+                            ('coordinates, 20000 atoms', large)):
+            cache = kim_edn.DocumentCache()
+            disk_cache = kim_edn.DiskCache(tempfile.mkdtemp(dir=tmpdir))
+            rows = [
+                ('load', best_of(lambda: kim_edn.load(path)), None),
+                ('load, cache hit', best_of(lambda: kim_edn.load(path, cache=cache)), cache.nbytes),
+                ('load, disk cache hit', best_of(lambda: kim_edn.load(path, disk_cache=disk_cache)),
+                 sum(entry.stat().st_size for entry in os.scandir(disk_cache.directory))),
+            ]
+            report(f'kim_edn.load, {title}', rows,
+                   header=('case', 'time [ms]', 'cached [bytes]'))
+
+
+if __name__ == '__main__':
+    main()
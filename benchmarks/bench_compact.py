@@ -0,0 +1,32 @@
+"""KIM-EDN text against the compact binary format."""
+import marshal
+
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+from benchmarks.bench_compile_encoder import property_instances
+
+
+def main():
+    for title, obj in (('coordinates, 20000 atoms', coordinates_document()),
+                       ('20000 property instances', property_instances())):
+        text = kim_edn.dumpb(obj)
+        compact = kim_edn.dumpb_compact(obj)
+        marshalled = marshal.dumps(obj)
+
+        report(f'encode, {title}', [
+            ('dumpb', best_of(lambda: kim_edn.dumpb(obj)), len(text)),
+            ('dumpb_compact', best_of(lambda: kim_edn.dumpb_compact(obj)), len(compact)),
+            ('marshal.dumps', best_of(lambda: marshal.dumps(obj)), len(marshalled)),
+        ])
+
+        report(f'decode, {title}', [
+            ('loads', best_of(lambda: kim_edn.loads(text)), len(text)),
+            ("loads, engine='json'", best_of(lambda: kim_edn.loads(text, engine='json')), len(text)),
+            ('loadb_compact', best_of(lambda: kim_edn.loadb_compact(compact)), len(compact)),
+            ('marshal.loads', best_of(lambda: marshal.loads(marshalled)), len(marshalled)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Per-record ``dumps`` against a compiled record encoder."""
+import random
+
+import kim_edn
+
+from benchmarks import best_of, report
+
+
+def property_instances(n=20000, seed=0):
+    """Return ``n`` property instances of the same shape."""
+    rng = random.Random(seed)
+    return [{
+        "property-id": "tag:brunnels@noreply.openkim.org,2016-05-11:property/atomic-mass",
+        "instance-id": i,
+        "species": {"source-value": rng.choice(["Al", "Ni", "Cu"])},
+        "mass": {"source-value": rng.random() * 100, "source-unit": "amu"},
+    } for i in range(n)]
+
+
+def main():
+    records = property_instances()
+    encode = kim_edn.compile_encoder(records[0])
+    dumps = kim_edn.dumps
+
+    rows = [
+        ('dumps per record', best_of(lambda: [dumps(r) for r in records]), None),
+        ('compile_encoder', best_of(lambda: [encode(r) for r in records]), None),
+    ]
+    report('Encoding 20000 property instances', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""``dump`` to different targets, writing every chunk or buffered writes."""
+import io
+import os
+import tempfile
+import tracemalloc
+
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+
+
+def main():
+    doc = coordinates_document()
+    # A document made of many small chunks
+    instances = [{
+        "property-id": doc["property-id"],
+        "instance-id": i,
+        "species": {"source-value": ["Al", "Ni"]},
+        "cohesive-potential-energy": doc["cohesive-potential-energy"],
+    } for i in range(20000)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'bench.edn')
+
+        targets = (
+            ('StringIO', lambda: io.StringIO()),
+            ('text file', lambda: open(path, 'w', encoding='utf-8')),
+            ('binary file (TextIOWrapper)',
+             lambda: io.TextIOWrapper(open(path, 'wb'), encoding='utf-8')),
+            ('binary file', lambda: open(path, 'wb')),
+        )
+
+        for title, obj in (('coordinates, 20000 atoms', doc),
+                           ('20000 property instances', instances)):
+            rows = []
+            for name, target in targets:
+                for buffer_size in (0, kim_edn.BUFFER_SIZE):
+                    def run():
+                        with target() as fp:
+                            kim_edn.dump(obj, fp, buffer_size=buffer_size)
+
+                    rows.append((f'{name}, buffer_size={buffer_size}', best_of(run), None))
+
+            rows.append(('file name', best_of(lambda: kim_edn.dump(obj, path)), None))
+            report(f'kim_edn.dump, {title}', rows)
+
+            rows = []
+            for name, func in (('dumps(obj).encode()', lambda: kim_edn.dumps(obj).encode()),
+                               ('dumpb(obj)', lambda: kim_edn.dumpb(obj))):
+                tracemalloc.start()
+                func()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                rows.append((name, best_of(func), peak))
+
+            report(f'UTF-8 bytes, {title}', rows,
+                   header=('case', 'time [ms]', 'peak [bytes]'))
+
+
+if __name__ == '__main__':
+    main()
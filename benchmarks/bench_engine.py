@@ -0,0 +1,22 @@
+"""``loads`` with the pure-Python decoder or the ``json`` engine."""
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+from benchmarks.bench_compile_encoder import property_instances
+
+
+def main():
+    for title, obj in (('coordinates, 20000 atoms', coordinates_document()),
+                       ('20000 property instances', property_instances())):
+        rows = []
+        for indent in (None, 4):
+            s = kim_edn.dumps(obj, indent=indent)
+            for engine in ('python', 'json'):
+                rows.append((f'engine={engine!r}, indent={indent}',
+                             best_of(lambda: kim_edn.loads(s, engine=engine)),
+                             len(s)))
+        report(f'kim_edn.loads, {title}', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""Size and throughput of KIM-EDN output with ``float_format``."""
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+
+
+def main():
+    doc = coordinates_document()
+    rows = []
+    for name, float_format in (('repr (default)', None),
+                               ("'.8g'", '.8g'),
+                               ('6 significant digits', 6)):
+        encoder = kim_edn.KIMEDNEncoder(float_format=float_format)
+        size = len(encoder.encode(doc))
+        rows.append((name, best_of(lambda: encoder.encode(doc)), size))
+
+    report('KIMEDNEncoder(float_format=...).encode, 20000 atoms', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Time of ``import kim_edn`` in a new interpreter, against a budget.
+
+The time is the cumulative import time reported by ``python -X importtime``,
+the best of several runs. The exit status is 1 if a module goes over its
+budget.
+"""
+import subprocess
+import sys
+
+from benchmarks import report
+
+# Budgets in milliseconds, including the standard modules imported
+BUDGETS = {
+    'kim_edn': 25,
+    'kim_edn.tool': 40,
+}
+
+
+def import_time(module, repeat=10):
+    """Return the best cumulative import time of ``module``, in seconds."""
+    best = None
+    for _ in range(repeat):
+        err = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             check=True, capture_output=True, text=True).stderr
+        for line in err.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                seconds = int(fields[1]) * 1e-6
+                best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main():
+    rows = []
+    over = []
+    for module, budget in BUDGETS.items():
+        seconds = import_time(module)
+        rows.append((f'import {module} (budget {budget} ms)', seconds, None))
+        if seconds * 1e3 > budget:
+            over.append(module)
+
+    report('Import time', rows)
+    if over:
+        print('Over budget:', ', '.join(over))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
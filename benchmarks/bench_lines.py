@@ -0,0 +1,27 @@
+"""Writing KIM-EDN lines: ``dumps`` and ``write`` per record, or ``dump_lines``."""
+import io
+
+import kim_edn
+
+from benchmarks import best_of, report
+from benchmarks.bench_compile_encoder import property_instances
+
+
+def main():
+    records = property_instances()
+
+    def per_record():
+        fp = io.StringIO()
+        for record in records:
+            fp.write(kim_edn.dumps(record))
+            fp.write('\n')
+
+    rows = [
+        ('dumps + write per record', best_of(per_record), None),
+        ('dump_lines', best_of(lambda: kim_edn.dump_lines(records, io.StringIO())), None),
+    ]
+    report('Writing 20000 property instances as KIM-EDN lines', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Memory of decoded property instances, as dicts and as records."""
+from collections import namedtuple
+import tracemalloc
+
+import kim_edn
+
+from benchmarks import best_of, report
+from benchmarks.bench_compile_encoder import property_instances
+
+AtomicMass = namedtuple('AtomicMass',
+                        ['property_id', 'instance_id', 'species', 'mass'])
+
+
+class Value(object):
+    __slots__ = ('source_value', 'source_unit')
+
+    def __init__(self, source_value, source_unit=None):
+        self.source_value = source_value
+        self.source_unit = source_unit
+
+
+RECORD_TYPES = {
+    "tag:brunnels@noreply.openkim.org,2016-05-11:property/atomic-mass": AtomicMass,
+    frozenset(['source-value']): Value,
+    frozenset(['source-value', 'source-unit']): Value,
+}
+
+
+def main():
+    text = kim_edn.dumps(property_instances())
+
+    rows = []
+    for name, kw in (('dicts', {}),
+                     ('records', {'record_types': RECORD_TYPES}),
+                     ("records, engine='json'",
+                      {'record_types': RECORD_TYPES, 'engine': 'json'})):
+        tracemalloc.start()
+        obj = kim_edn.loads(text, **kw)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del obj
+        rows.append((name, best_of(lambda: kim_edn.loads(text, **kw)), size))
+
+    report(f'Decoding 20000 property instances ({len(text):,} bytes)', rows,
+           header=('case', 'time [ms]', 'kept [bytes]'))
+
+
+if __name__ == '__main__':
+    main()
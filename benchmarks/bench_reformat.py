@@ -0,0 +1,41 @@
+"""Pretty-printing a file: ``load`` + ``dump``, or the token ``reformat``."""
+import os
+import tempfile
+import tracemalloc
+
+import kim_edn
+from kim_edn.reformat import reformat
+
+from benchmarks import best_of, coordinates_document, report
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, 'in.edn')
+        dst = os.path.join(tmpdir, 'out.edn')
+        kim_edn.dump(coordinates_document(), src)
+
+        def decode_encode():
+            kim_edn.dump(kim_edn.load(src), dst, indent=4)
+
+        def tokens():
+            with open(src, encoding='utf-8') as fin, \
+                    open(dst, 'w', encoding='utf-8') as fout:
+                reformat(fin, fout, indent=4)
+
+        rows = []
+        for name, func in (('load + dump', decode_encode),
+                           ('reformat', tokens)):
+            tracemalloc.start()
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            rows.append((name, best_of(func), peak))
+
+        report(f'Pretty-printing {os.path.getsize(src):,} bytes '
+               '(coordinates, 20000 atoms)', rows,
+               header=('case', 'time [ms]', 'peak [bytes]'))
+
+
+if __name__ == '__main__':
+    main()
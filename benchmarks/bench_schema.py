@@ -0,0 +1,57 @@
+"""Schema-guided decoding against decoding and then validating."""
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+
+DEFINITION = {
+    "property-id": "tag:staff@noreply.openkim.org,2014-04-15:property/structure-triclinic-crystal-npt",
+    "property-title": "Crystal structure (triclinic)",
+    "property-description": "A triclinic crystal structure",
+    "species": {"type": "string", "has-unit": False, "extent": [":"], "required": True},
+    "basis-atom-coordinates": {"type": "float", "has-unit": False, "extent": [":", 3], "required": True},
+    "cohesive-potential-energy": {"type": "float", "has-unit": True, "extent": [], "required": False},
+}
+
+TYPES = {"string": str, "file": str, "float": (float, int), "int": int, "bool": bool}
+
+
+def validate(instance, definition):
+    """Check ``instance`` by interpreting ``definition``, in a tree walk."""
+    def check(value, kind, extent):
+        if not extent:
+            return isinstance(value, TYPES[kind])
+        n = extent[0]
+        return (isinstance(value, list) and (n == ':' or len(value) == n)
+                and all(check(v, kind, extent[1:]) for v in value))
+
+    for key, value in instance.items():
+        if key in ('property-id', 'instance-id', 'disclaimer'):
+            continue
+        spec = definition[key]
+        if not check(value['source-value'], spec['type'], spec['extent']):
+            raise ValueError(key)
+        if spec['has-unit'] and 'source-unit' not in value:
+            raise ValueError(key)
+    for key, spec in definition.items():
+        if isinstance(spec, dict) and spec['required'] and key not in instance:
+            raise ValueError(key)
+
+
+def main():
+    text = kim_edn.dumps(coordinates_document())
+
+    def then_validate():
+        validate(kim_edn.loads(text), DEFINITION)
+
+    schema = kim_edn.loads(kim_edn.dumps(DEFINITION))
+    assert kim_edn.loads(text, schema=schema) == kim_edn.loads(text)
+
+    report(f'coordinates, 20000 atoms ({len(text):,} bytes)', [
+        ('loads', best_of(lambda: kim_edn.loads(text)), None),
+        ('loads, then validate', best_of(then_validate), None),
+        ('loads, schema=', best_of(lambda: kim_edn.loads(text, schema=schema)), None),
+    ])
+
+
+if __name__ == '__main__':
+    main()
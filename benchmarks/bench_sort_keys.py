@@ -0,0 +1,26 @@
+"""Cost of ``sort_keys=True`` on maps sharing the same key sets."""
+import kim_edn
+
+from benchmarks import best_of, report
+
+
+def records(n=5000, nkeys=24):
+    """Return ``n`` flat maps with the same ``nkeys`` keys."""
+    keys = [f'source-value-{i:02d}' for i in reversed(range(nkeys))]
+    return [dict.fromkeys(keys, i) for i in range(n)]
+
+
+def main():
+    for nkeys in (4, 16, 24, 64):
+        doc = records(nkeys=nkeys)
+        rows = []
+        for sort_keys in (False, True):
+            encoder = kim_edn.KIMEDNEncoder(sort_keys=sort_keys)
+            rows.append((f'sort_keys={sort_keys}',
+                         best_of(lambda: encoder.encode(doc)), None))
+
+        report(f'KIMEDNEncoder.encode, 5000 maps of {nkeys} keys', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""``loads`` of many documents by 1, 2, 4 and 8 threads sharing the default
+decoder.
+
+With the GIL the time stays about the same as with one thread; on a
+free-threaded build it falls with the number of threads, up to the number
+of cores.
+"""
+import concurrent.futures
+import os
+import sys
+
+import kim_edn
+
+from benchmarks import best_of, report
+from benchmarks.bench_compile_encoder import property_instances
+
+
+def main():
+    docs = [kim_edn.dumps(instance) for instance in property_instances(8000)]
+
+    rows = []
+    for nthreads in (1, 2, 4, 8):
+        chunks = [docs[i::nthreads] for i in range(nthreads)]
+        with concurrent.futures.ThreadPoolExecutor(nthreads) as executor:
+            def run():
+                list(executor.map(lambda chunk: [kim_edn.loads(doc) for doc in chunk], chunks))
+
+            rows.append((f'{nthreads} threads', best_of(run), None))
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    report(f'loads of {len(docs)} documents, {os.cpu_count()} CPUs, '
+           f'GIL {"enabled" if gil else "disabled"}', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""Re-encoding KIM-EDN lines with ``kim_edn.tool --edn-lines --jobs N``."""
+import os
+import subprocess
+import sys
+import tempfile
+
+import kim_edn
+
+from benchmarks import best_of, report
+from benchmarks.bench_compile_encoder import property_instances
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infile = os.path.join(tmpdir, 'instances.edn')
+        kim_edn.dump_lines(property_instances(n=100000), infile)
+        size = os.path.getsize(infile)
+
+        rows = []
+        for jobs in sorted({1, 2, 4, os.cpu_count() or 1}):
+            args = (sys.executable, '-m', 'kim_edn.tool', '--edn-lines',
+                    '--jobs', str(jobs), infile, os.devnull)
+            seconds = best_of(lambda: subprocess.run(args, check=True), repeat=3)
+            rows.append((f'--jobs {jobs}', seconds, size))
+
+    report('Re-encoding 100000 property instances as KIM-EDN lines', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Default encoder against the trusted-input profile.
+
+``KIMEDNEncoder(check_circular=False, validate_keys=False)`` skips the
+circular reference bookkeeping and the key checks. It is only valid for
+acyclic data whose keys are all ``str``.
+
+"""
+import kim_edn
+
+from benchmarks import best_of, report
+
+
+def property_instances(n=20000):
+    """Return ``n`` small property instances."""
+    return [{
+        "property-id": "tag:brunnels@noreply.openkim.org,2016-05-11:property/atomic-mass",
+        "instance-id": i,
+        "species": {"source-value": "Al"},
+        "mass": {"source-value": 26.9815385, "source-unit": "amu"},
+    } for i in range(n)]
+
+
+def main():
+    doc = property_instances()
+    rows = []
+    for name, kw in (('default', {}),
+                     ('check_circular=False', {'check_circular': False}),
+                     ('trusted profile', {'check_circular': False,
+                                          'validate_keys': False})):
+        encoder = kim_edn.KIMEDNEncoder(**kw)
+        rows.append((name, best_of(lambda: encoder.encode(doc)), None))
+
+    report('KIMEDNEncoder.encode, 20000 property instances', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Interpreted validation against a compiled validator."""
+import kim_edn
+
+from benchmarks import best_of, coordinates_document, report
+from benchmarks.bench_compile_encoder import property_instances
+from benchmarks.bench_schema import DEFINITION, validate
+
+ATOMIC_MASS = {
+    "property-id": "tag:brunnels@noreply.openkim.org,2016-05-11:property/atomic-mass",
+    "property-title": "Atomic mass",
+    "property-description": "The atomic mass of the element",
+    "species": {"type": "string", "has-unit": False, "extent": [], "required": True},
+    "mass": {"type": "float", "has-unit": True, "extent": [], "required": True},
+}
+
+
+def main():
+    instances = property_instances()
+    compiled = kim_edn.compile_validator(ATOMIC_MASS)
+
+    def interpreted():
+        for instance in instances:
+            validate(instance, ATOMIC_MASS)
+
+    def compiled_all():
+        for instance in instances:
+            compiled(instance)
+
+    rows = [('interpreted', best_of(interpreted), None),
+            ('compile_validator', best_of(compiled_all), None)]
+    report(f'Validating {len(instances)} property instances', rows)
+    print(f'{len(instances) * 60 / rows[1][1]:,.0f} instances per minute\n')
+
+    document = coordinates_document()
+    compiled = kim_edn.compile_validator(DEFINITION)
+    rows = [('interpreted', best_of(lambda: validate(document, DEFINITION)), None),
+            ('compile_validator', best_of(lambda: compiled(document)), None)]
+
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        arrays = dict(document)
+        arrays['basis-atom-coordinates'] = {
+            'source-value': numpy.array(
+                document['basis-atom-coordinates']['source-value'])}
+        rows.append(('compile_validator, NumPy array',
+                     best_of(lambda: compiled(arrays)), None))
+
+    report('Validating coordinates, 20000 atoms', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -149,14 +149,31 @@ All Rights Reserved
 """
 
 import codecs
+import io
+import itertools
+import os
 from .encoder import KIMEDNEncoder
 from .decoder import KIMEDNDecoder, KIMEDNDecodeError
+from . import _util
 
 __all__ = [
+    'adump',
+    'aiter_lines',
+    'aload',
+    'aloads',
+    'compile_encoder',
+    'compile_validator',
     'dump',
+    'dump_lines',
+    'dumpb',
+    'dumpb_compact',
     'dumps',
     'load',
+    'load_lines',
+    'loadb_compact',
     'loads',
+    'DiskCache',
+    'DocumentCache',
     'KIMEDNDecoder',
     'KIMEDNDecodeError',
     'KIMEDNEncoder',
@@ -165,17 +182,40 @@ __all__ = [
 __author__ = 'Bob Ippolito <bob@redivi.com> Yaser Afshar <yafshar@umn.edu>'
 
 
-_default_encoder = KIMEDNEncoder()
+# Number of characters ``dump`` collects from the encoder before each write
+BUFFER_SIZE = 1 << 16
 
 
-def dump(obj, fp, *, cls=None, indent=None, default=None, sort_keys=False):
+def _is_binary(fp):
+    """Return whether ``fp`` is a file-like object taking ``bytes``."""
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+
+    # The mode of some file-like objects is not a str, such as an int
+    mode = getattr(fp, 'mode', '')
+    return isinstance(mode, str) and 'b' in mode
+
+
+def dump(obj, fp, *, check_circular=True, cls=None, indent=None, default=None,
+         sort_keys=False, float_format=None, validate_keys=True,
+         stream_iterables=False, buffer_size=BUFFER_SIZE):
     r"""Serialize ``obj``.
 
     Serialize ``obj`` as a KIM-EDN formatted stream to ``fp`` (a ``.write()``
-    -supporting file-like object or a name string to open a file).
+    -supporting file-like object or a name string to open a file). Binary
+    file-like objects are written UTF-8 encoded ``bytes``.
 
     By default ``dict`` keys that are not basic types (``str``, ``int``,
-    ``float``, ``bool``) will be raising a ``TypeError``.
+    ``float``, ``bool``) will be raising a ``TypeError``. If ``validate_keys``
+    is false, keys are not checked or converted and must all be ``str``.
+
+    If ``check_circular`` is false, then the circular reference check
+    for container types will be skipped and a circular reference will
+    result in an ``RecursionError`` (or worse).
+
+    If ``stream_iterables`` is true, iterables other than ``list`` (e.g.
+    generators), except mappings and sets, are serialized as vectors, item
+    by item.
 
     If ``indent`` is a non-negative integer, then EDN array elements and object
     members will be pretty-printed with that indent level. An indent level of 0
@@ -187,44 +227,127 @@ def dump(obj, fp, *, cls=None, indent=None, default=None, sort_keys=False):
     If *sort_keys* is true (default: ``False``), then the output of dictionaries
     will be sorted by key.
 
+    ``float_format`` is a format spec of type e, E, f, F, g or G with an
+    optional precision (e.g. ``'.8g'``), a number of significant digits,
+    or a callable used to write floats instead of ``float.__repr__``.
+
+    The output is collected into strings of about ``buffer_size`` characters
+    (default: ``BUFFER_SIZE``) before each ``fp.write()``. A file name is
+    opened with a buffer of at least that many bytes and the UTF-8 encoding.
+
     To use a custom ``KIMEDNEncoder`` subclass (e.g. one that overrides the
     ``.default()`` method to serialize additional types), specify it with
     the ``cls`` kwarg; otherwise ``KIMEDNEncoder`` is used.
 
     """
-    # cached encoder
-    if (cls is None
-        and indent is None
-        and default is None
-            and not sort_keys):
-        iterable = _default_encoder.iterencode(obj)
+    iterable = _get_encoder(cls,
+                            check_circular,
+                            indent,
+                            default,
+                            sort_keys,
+                            float_format,
+                            validate_keys,
+                            stream_iterables).iterencode(obj)
+
+    _write(itertools.chain(iterable, ("\n",)), fp, buffer_size)
+
+
+def dump_lines(iterable, fp, *, cls=None, buffer_size=BUFFER_SIZE, **kw):
+    r"""Serialize the objects of ``iterable`` as KIM-EDN lines.
+
+    Serialize each object of ``iterable`` as one compact KIM-EDN document
+    per line (the EDN-lines format) to ``fp`` (a ``.write()``-supporting
+    file-like object, binary or text, or a name string to open a file).
+
+    A single encoder is built from the keyword arguments (the options of
+    ``KIMEDNEncoder``, except ``indent``) and reused for every object, and the
+    output is written in pieces of about ``buffer_size`` characters.
+
+    To use a custom ``KIMEDNEncoder`` subclass, specify it with the ``cls``
+    kwarg; otherwise ``KIMEDNEncoder`` is used.
+
+    """
+    if kw.get('indent') is not None:
+        raise ValueError('KIM-EDN lines are written compact, '
+                         'indent must be None')
+
+    if cls is None:
+        cls = KIMEDNEncoder
+
+    encoder = cls(**kw)
+    if type(encoder).iterencode is KIMEDNEncoder.iterencode:
+        # Reuse one iterencoder, instead of building one per object
+        _iterencode = encoder._iterencoder()
+
+        def iterencode(o):
+            return _iterencode(o, 0)
     else:
-        if cls is None:
-            cls = KIMEDNEncoder
+        iterencode = encoder.iterencode
 
-        iterable = cls(indent=indent,
-                       default=default,
-                       sort_keys=sort_keys).iterencode(obj)
+    def chunks():
+        for obj in iterable:
+            yield from iterencode(obj)
+            yield "\n"
 
+    _write(chunks(), fp, buffer_size)
+
+
+def _write(chunks, fp, buffer_size):
+    """Write ``chunks`` to ``fp``, a file-like object or a file name."""
     if isinstance(fp, str):
         # See if this is a file name
-        with open(fp, 'w') as fo:
-            for chunk in iterable:
-                fo.write(chunk)
-            fo.write("\n")
+        with open(fp, 'w', encoding='utf-8',
+                  buffering=max(buffer_size, io.DEFAULT_BUFFER_SIZE)) as fo:
+            fo.writelines(_util.buffered(chunks, buffer_size))
+    elif _is_binary(fp):
+        for data in _util.buffered(chunks, buffer_size):
+            fp.write(data.encode('utf-8'))
     else:
-        # could accelerate with writelines in some versions
-        # of Python, at a debuggability cost
-        for chunk in iterable:
-            fp.write(chunk)
-        fp.write("\n")
+        # fp only needs to support .write()
+        for data in _util.buffered(chunks, buffer_size):
+            fp.write(data)
+
+
+def dumpb(obj, *, check_circular=True, cls=None, indent=None, default=None,
+          sort_keys=False, float_format=None, validate_keys=True,
+          stream_iterables=False, buffer_size=BUFFER_SIZE):
+    r"""Serialize ``obj`` to KIM-EDN formatted UTF-8 ``bytes``.
 
+    The output of the encoder is encoded in pieces of about ``buffer_size``
+    characters, so no ``str`` of the whole document is built. The other
+    arguments have the same meaning as in ``dumps``, and
+    ``dumpb(obj).decode('utf-8') == dumps(obj)``.
 
-def dumps(obj, *, cls=None, indent=None, default=None, sort_keys=False):
+    """
+    iterable = _get_encoder(cls,
+                            check_circular,
+                            indent,
+                            default,
+                            sort_keys,
+                            float_format,
+                            validate_keys,
+                            stream_iterables).iterencode(obj)
+
+    return b''.join([data.encode('utf-8')
+                     for data in _util.buffered(iterable, buffer_size)])
+
+
+def dumps(obj, *, check_circular=True, cls=None, indent=None, default=None,
+          sort_keys=False, float_format=None, validate_keys=True,
+          stream_iterables=False):
     r"""Serialize ``obj`` to a KIM-EDN formatted ``str``.
 
     By default ``dict`` keys that are not basic types (``str``, ``int``,
-    ``float``, ``bool``) will be raising a ``TypeError``.
+    ``float``, ``bool``) will be raising a ``TypeError``. If ``validate_keys``
+    is false, keys are not checked or converted and must all be ``str``.
+
+    If ``check_circular`` is false, then the circular reference check
+    for container types will be skipped and a circular reference will
+    result in an ``RecursionError`` (or worse).
+
+    If ``stream_iterables`` is true, iterables other than ``list`` (e.g.
+    generators), except mappings and sets, are serialized as vectors, item
+    by item.
 
     If ``indent`` is a non-negative integer, then KIM-EDN array elements and
     object members will be pretty-printed with that indent level. An indent
@@ -236,27 +359,76 @@ def dumps(obj, *, cls=None, indent=None, default=None, sort_keys=False):
     If *sort_keys* is true (default: ``False``), then the output of
     dictionaries will be sorted by key.
 
+    ``float_format`` is a format spec of type e, E, f, F, g or G with an
+    optional precision (e.g. ``'.8g'``), a number of significant digits,
+    or a callable used to write floats instead of ``float.__repr__``.
+
     To use a custom ``KIMEDNEncoder`` subclass (e.g. one that overrides the
     ``.default()`` method to serialize additional types), specify it with the
     ``cls`` kwarg; otherwise ``KIMEDNEncoder`` is used.
 
     """
+    return _get_encoder(cls,
+                        check_circular,
+                        indent,
+                        default,
+                        sort_keys,
+                        float_format,
+                        validate_keys,
+                        stream_iterables).encode(obj)
+
+
+def _get_encoder(cls, check_circular, indent, default, sort_keys,
+                 float_format, validate_keys, stream_iterables):
+    """Return the encoder for the ``dumps`` arguments."""
     # cached encoder
     if (cls is None
         and indent is None
-        and default is None and
-            not sort_keys):
-        return _default_encoder.encode(obj)
+        and default is None
+        and not sort_keys
+        and float_format is None
+        and check_circular
+        and validate_keys
+            and not stream_iterables):
+        return _util.default_encoder
 
     if cls is None:
         cls = KIMEDNEncoder
 
-    return cls(indent=indent,
+    return cls(check_circular=check_circular,
+               indent=indent,
                default=default,
-               sort_keys=sort_keys).encode(obj)
+               sort_keys=sort_keys,
+               float_format=float_format,
+               validate_keys=validate_keys,
+               stream_iterables=stream_iterables)
+
+
+def compile_encoder(example_or_schema, *, cls=None, default=None,
+                    sort_keys=False, float_format=None):
+    r"""Return a function serializing records of a fixed shape.
+
+    ``example_or_schema`` is an example record (a ``dict``), or a ``dict`` of
+    each key to the type of its value (``str``, ``int``, ``float``, ``bool``,
+    ``list`` or ``dict``). The returned function takes a record and returns
+    the same compact KIM-EDN ``str`` as ``dumps``. The keys and separators of
+    the shape are escaped and laid out once, so a matching record only has
+    its values formatted. Records which don't match the shape are serialized
+    by the general encoder.
 
+    ``default``, ``sort_keys`` and ``float_format`` have the same meaning as
+    in ``dumps``.
+
+    To use a custom ``KIMEDNEncoder`` subclass, specify it with the ``cls``
+    kwarg; otherwise ``KIMEDNEncoder`` is used.
+
+    """
+    if cls is None:
+        cls = KIMEDNEncoder
 
-_default_decoder = KIMEDNDecoder()
+    return cls(default=default,
+               sort_keys=sort_keys,
+               float_format=float_format).record_encoder(example_or_schema)
 
 
 def detect_encoding(b):
@@ -293,8 +465,12 @@ def detect_encoding(b):
     return 'utf-8'
 
 
+_default_document_cache = None
+
+
 def load(fp, *, cls=None, parse_float=None, parse_int=None,
-         object_hook=None, object_pairs_hook=None):
+         object_hook=None, object_pairs_hook=None, record_types=None,
+         schema=None, cache=None, disk_cache=None):
     r"""Deserialize ``fp``.
 
     Deserialize ``fp`` (a ``.read()``-supporting file-like object, or a name
@@ -312,10 +488,59 @@ def load(fp, *, cls=None, parse_float=None, parse_int=None,
     This feature can be used to implement custom decoders.  If ``object_hook``
     is also defined, the ``object_pairs_hook`` takes priority.
 
+    ``record_types`` maps property ids, or sets of keys, to the types to
+    build the matching objects into, as in ``KIMEDNDecoder``.
+
+    ``schema``, if specified, is a KIM property definition which the
+    document, a property instance, is checked against while it is decoded,
+    as in ``loads``.
+
     To use a custom ``KIMEDNDecoder`` subclass, specify it with the ``cls``
     kwarg; otherwise ``KIMEDNDecoder`` is used.
 
+    If ``cache`` is a ``DocumentCache``, or true for a cache shared by the
+    module, a file name is decoded once and later loads of the unchanged
+    file return a copy of the cached result.
+
+    If ``disk_cache`` is a ``DiskCache``, or the name of a directory, a
+    binary copy of the decoded file is kept there, and later loads of a
+    file with the same content, by any process, read it instead of
+    decoding the text. It cannot be used with ``cls``, the hooks or
+    ``schema``.
+
     """
+    if disk_cache is not None:
+        if (cls is not None or parse_float is not None
+                or parse_int is not None or object_hook is not None
+                or object_pairs_hook is not None or record_types
+                or schema is not None):
+            raise ValueError('disk_cache cannot be used with cls, hooks, '
+                             'record_types or schema')
+
+    if cache is not None and cache is not False and isinstance(fp, str):
+        if cache is True:
+            global _default_document_cache
+            if _default_document_cache is None:
+                from .cache import DocumentCache
+                _default_document_cache = DocumentCache()
+            cache = _default_document_cache
+
+        return cache.load(fp,
+                          cls=cls,
+                          parse_float=parse_float,
+                          parse_int=parse_int,
+                          object_hook=object_hook,
+                          object_pairs_hook=object_pairs_hook,
+                          record_types=record_types,
+                          schema=schema,
+                          disk_cache=disk_cache)
+
+    if disk_cache is not None and isinstance(fp, str) and os.path.isfile(fp):
+        from .cache import DiskCache
+        if not isinstance(disk_cache, DiskCache):
+            disk_cache = DiskCache(disk_cache)
+        return disk_cache.load(fp)
+
     if isinstance(fp, str):
         try:
             # See if this is a file name
@@ -332,11 +557,14 @@ def load(fp, *, cls=None, parse_float=None, parse_int=None,
                  parse_float=parse_float,
                  parse_int=parse_int,
                  object_hook=object_hook,
-                 object_pairs_hook=object_pairs_hook)
+                 object_pairs_hook=object_pairs_hook,
+                 record_types=record_types,
+                 schema=schema)
 
 
 def loads(s, *, cls=None, parse_float=None, parse_int=None,
-          object_hook=None, object_pairs_hook=None):
+          object_hook=None, object_pairs_hook=None, record_types=None,
+          schema=None, engine='python'):
     r"""Deserialize ``s``.
 
     Deserialize ``s`` (a ``str``, ``bytes`` or ``bytearray`` instance
@@ -363,10 +591,33 @@ def loads(s, *, cls=None, parse_float=None, parse_int=None,
     int(num_str). This can be used to use another datatype or parser
     for EDN integers (e.g. float).
 
+    ``record_types`` maps property ids, or sets of keys, to the types to
+    build the matching objects into, as in ``KIMEDNDecoder``.
+
+    ``schema``, if specified, is a KIM property definition. The document
+    must then be an instance of this property: each key is checked for its
+    declared type and extent, ``"source-unit"`` and required keys, as soon
+    as its value is decoded, and the first invalid key raises a
+    ``KIMEDNDecodeError`` at the position of its value. It cannot be used
+    with ``cls``, the hooks or ``record_types``.
+
     To use a custom ``KIMEDNDecoder`` subclass, specify it with the ``cls``
     kwarg; otherwise ``KIMEDNDecoder`` is used.
 
+    If ``engine`` is ``'json'``, ``s`` is rewritten into JSON text and
+    decoded by the C-accelerated scanner of the standard ``json`` module.
+    The result is the same as with the default ``'python'`` engine. A
+    document which cannot be rewritten, such as a malformed one, is decoded
+    by the pure-Python decoder, so the errors are the same too. This engine
+    cannot be used with ``cls`` or ``schema``.
+
     """
+    if engine not in ('python', 'json'):
+        raise ValueError(f"engine must be 'python' or 'json', not {engine!r}")
+
+    if engine == 'json' and (cls is not None or schema is not None):
+        raise ValueError("engine='json' cannot be used with cls or schema")
+
     if isinstance(s, str):
         if s.startswith('\ufeff'):
             msg = 'Unexpected UTF-8 BOM (decode using utf-8-sig)'
@@ -379,34 +630,92 @@ def loads(s, *, cls=None, parse_float=None, parse_int=None,
 
         s = s.decode(detect_encoding(s), 'surrogatepass')
 
-    if (cls is None
-        and parse_float is None
-        and parse_int is None
-        and object_hook is None and
-            object_pairs_hook is None):
-        return _default_decoder.decode(s)
+    decoder = _util.get_decoder(cls,
+                                parse_float,
+                                parse_int,
+                                object_hook,
+                                object_pairs_hook,
+                                record_types,
+                                schema)
 
-    if cls is None:
-        cls = KIMEDNDecoder
+    if engine == 'json':
+        from . import bridge
+        return bridge.loads(s, decoder.decode,
+                            parse_float=parse_float,
+                            parse_int=parse_int,
+                            object_hook=object_hook,
+                            object_pairs_hook=decoder.object_pairs_hook)
+
+    return decoder.decode(s)
 
-    if type(cls) is type:
-        kw = {}
-        if parse_float is not None:
-            kw['parse_float'] = parse_float
 
-        if parse_int is not None:
-            kw['parse_int'] = parse_int
+def load_lines(fp, *, cls=None, parse_float=None, parse_int=None,
+               object_hook=None, object_pairs_hook=None, record_types=None,
+               schema=None, skip_empty=True):
+    r"""Deserialize KIM-EDN lines lazily.
 
-        if object_hook is not None:
-            kw['object_hook'] = object_hook
+    Deserialize ``fp`` (an iterable of lines, such as a text or binary
+    file-like object, or a name string to a file) containing one KIM-EDN
+    document per line (the EDN-lines format), and yield the decoded Python
+    objects one at a time. A file name is opened with a large buffer and the
+    UTF-8 encoding, and is closed once the iteration ends.
 
-        if object_pairs_hook is not None:
-            kw['object_pairs_hook'] = object_pairs_hook
+    If ``skip_empty`` is true (the default), blank lines and lines holding
+    only a comment are skipped.
 
-        return cls(**kw).decode(s)
+    A ``KIMEDNDecodeError`` message names the line of ``fp`` which failed to
+    decode; its ``doc`` and ``pos`` refer to that line.
+
+    The other arguments have the same meaning as in ``loads``, and a single
+    decoder is used for all the lines.
+
+    """
+    decoder = _util.get_decoder(cls,
+                                parse_float,
+                                parse_int,
+                                object_hook,
+                                object_pairs_hook,
+                                record_types,
+                                schema)
+
+    if isinstance(fp, str):
+        with open(fp, encoding='utf-8', buffering=BUFFER_SIZE) as fo:
+            yield from _util.decode_lines(fo, decoder.decode, skip_empty)
+    else:
+        yield from _util.decode_lines(fp, decoder.decode, skip_empty)
+
+
+# The optional parts of the module, imported on first use
+_LAZY_NAMES = {
+    'DiskCache': 'cache',
+    'DocumentCache': 'cache',
+    'adump': 'aio',
+    'aiter_lines': 'aio',
+    'aload': 'aio',
+    'aloads': 'aio',
+    'compile_validator': 'schema',
+    'dumpb_compact': 'compact',
+    'loadb_compact': 'compact',
+}
+
+
+def __getattr__(name):
+    """Import the optional parts of the module, and the version, lazily."""
+    if name == '__version__':
+        # Versioneer may run git to find the version
+        from . import _version
+        value = _version.get_versions()['version']
+    elif name in _LAZY_NAMES:
+        import importlib
+        module = importlib.import_module(f'.{_LAZY_NAMES[name]}', __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-    return cls.decode(s)
+    globals()[name] = value
+    return value
 
 
-from . import _version  # noqa: E402
-__version__ = _version.get_versions()['version']
+def __dir__():
+    """Return the names of the module, including the lazy ones."""
+    return sorted(set(globals()) | set(_LAZY_NAMES) | {'__version__'})
@@ -0,0 +1,91 @@
+"""Helpers shared by the modules of kim_edn.
+
+They are internal, and may change without notice.
+"""
+from .decoder import KIMEDNDecoder, KIMEDNDecodeError
+from .encoder import KIMEDNEncoder
+
+# The encoder and decoder of the default options
+default_encoder = KIMEDNEncoder()
+default_decoder = KIMEDNDecoder()
+
+
+def buffered(chunks, buffer_size):
+    """Join ``chunks`` into strings of at least ``buffer_size`` characters."""
+    buf = []
+    buf_append = buf.append
+    size = 0
+    for chunk in chunks:
+        buf_append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield ''.join(buf)
+            buf.clear()
+            size = 0
+
+    if buf:
+        yield ''.join(buf)
+
+
+def decode_lines(lines, decode, skip_empty, lineno=1, _ws=', \t\n\r'):
+    """Yield the decoded KIM-EDN documents of ``lines``."""
+    for lineno, line in enumerate(lines, lineno):
+        if not isinstance(line, str):
+            line = line.decode('utf-8')
+
+        if skip_empty:
+            stripped = line.lstrip(_ws)
+            if not stripped or stripped[0] == ';':
+                continue
+
+        try:
+            yield decode(line)
+        except KIMEDNDecodeError as err:
+            msg = f'{err.msg} (KIM-EDN lines, line {lineno})'
+            raise KIMEDNDecodeError(msg, err.doc, err.pos) from None
+
+
+def get_decoder(cls, parse_float, parse_int, object_hook, object_pairs_hook,
+                record_types=None, schema=None):
+    """Return the decoder for the ``loads`` arguments."""
+    if schema is not None:
+        if (cls is not None or parse_float is not None
+                or parse_int is not None or object_hook is not None
+                or object_pairs_hook is not None or record_types):
+            raise ValueError('schema cannot be used with cls, hooks or '
+                             'record_types')
+
+        from .schema import SchemaDecoder
+        return SchemaDecoder(schema)
+
+    if (cls is None
+        and parse_float is None
+        and parse_int is None
+        and object_hook is None
+        and object_pairs_hook is None and
+            not record_types):
+        return default_decoder
+
+    if cls is None:
+        cls = KIMEDNDecoder
+
+    if type(cls) is type:
+        kw = {}
+        if parse_float is not None:
+            kw['parse_float'] = parse_float
+
+        if parse_int is not None:
+            kw['parse_int'] = parse_int
+
+        if object_hook is not None:
+            kw['object_hook'] = object_hook
+
+        if object_pairs_hook is not None:
+            kw['object_pairs_hook'] = object_pairs_hook
+
+        if record_types:
+            kw['record_types'] = record_types
+
+        return cls(**kw)
+
+    return cls
@@ -0,0 +1,204 @@
+"""KIM-EDN over asyncio streams.
+
+``aload`` reads a stream reader to its end without blocking the event
+loop, and then decodes the whole document; the text of the document is
+held in memory, as there is no incremental parser. ``aiter_lines``
+decodes each line as soon as it has arrived, holding at most one line
+and one chunk. ``adump`` writes the encoder output in pieces, waiting for
+the stream writer to drain after each piece. The readers and writers may
+be ``asyncio`` streams, or objects with the same ``read`` and ``write``
+methods, such as the streams of ``aiohttp``.
+
+``aloads`` decodes the large documents in a worker thread or process, so
+that the event loop is not blocked.
+"""
+import asyncio
+import codecs
+import concurrent.futures
+import functools
+import inspect
+import io
+import threading
+
+import kim_edn
+from kim_edn import _util
+
+__all__ = ['aload', 'aloads', 'aiter_lines', 'adump']
+
+READ_SIZE = 1 << 14
+# The size from which aloads decodes in an executor
+THRESHOLD = 1 << 16
+
+# The executors of aloads, created on first use and kept for later calls
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+async def _read(reader, read_size):
+    """Return the next chunk of ``reader``."""
+    chunk = await reader.read(read_size)
+    # Let the other tasks run, even if the data was already buffered
+    await asyncio.sleep(0)
+    return chunk
+
+
+async def aload(reader, *, cls=None, parse_float=None, parse_int=None,
+                object_hook=None, object_pairs_hook=None,
+                read_size=READ_SIZE):
+    r"""Deserialize the KIM-EDN document of the stream ``reader``.
+
+    ``reader`` supports ``await reader.read(n)``, returning UTF-8 encoded
+    ``bytes`` (or ``str``), and an empty chunk at the end of the stream.
+
+    The data is read ``read_size`` bytes at a time, letting the other
+    tasks run between the chunks, and the whole document is then decoded
+    as by ``aloads``, so that the event loop is not blocked for long. The
+    document is not parsed as it arrives: its text is collected in memory
+    first. The other arguments and the errors are the same as in
+    ``loads``.
+
+    """
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    text = io.StringIO()
+    while True:
+        chunk = await _read(reader, read_size)
+        if isinstance(chunk, str):
+            text.write(chunk)
+        else:
+            text.write(utf8.decode(chunk, not chunk))
+
+        if not chunk:
+            break
+
+    return await aloads(text.getvalue(), cls=cls, parse_float=parse_float,
+                        parse_int=parse_int, object_hook=object_hook,
+                        object_pairs_hook=object_pairs_hook)
+
+
+async def aloads(s, *, executor='thread', threshold=THRESHOLD, **kw):
+    r"""Deserialize ``s`` without blocking the event loop.
+
+    ``s`` and the keyword arguments are as in ``loads``. A document of at
+    least ``threshold`` characters (or bytes) is decoded by ``executor``,
+    smaller ones are decoded in the event loop, where it costs less than
+    handing them over.
+
+    ``executor`` is ``'thread'`` or ``'process'`` for a pool of worker
+    threads or processes shared by all the calls, created on first use,
+    or a ``concurrent.futures.Executor``. With ``None``, every document is
+    decoded in the event loop. The worker processes are kept between
+    calls, with ``kim_edn`` and its default decoder ready to use; the
+    hooks given to them must be picklable.
+
+    """
+    if executor is None or len(s) < threshold:
+        return kim_edn.loads(s, **kw)
+
+    if isinstance(executor, str):
+        executor = _get_executor(executor)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor,
+                                      functools.partial(kim_edn.loads, s,
+                                                        **kw))
+
+
+def _get_executor(kind):
+    """Return the shared executor of ``kind``, 'thread' or 'process'."""
+    if kind not in ('thread', 'process'):
+        raise ValueError(f"executor must be 'thread', 'process', None or "
+                         f"an Executor, not {kind!r}")
+
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            if kind == 'thread':
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix='kim_edn')
+            else:
+                executor = concurrent.futures.ProcessPoolExecutor()
+            _executors[kind] = executor
+
+    return executor
+
+
+async def aiter_lines(reader, *, cls=None, parse_float=None, parse_int=None,
+                      object_hook=None, object_pairs_hook=None,
+                      record_types=None, schema=None, skip_empty=True,
+                      read_size=READ_SIZE):
+    r"""Deserialize the KIM-EDN lines of the stream ``reader`` lazily.
+
+    ``reader`` is as in ``aload``. Each line holds one KIM-EDN document
+    (the EDN-lines format), and the decoded objects are yielded as soon as
+    their line has arrived. Lines may be longer than ``read_size``.
+
+    The other arguments and the errors are the same as in ``load_lines``.
+
+    """
+    decode = _util.get_decoder(cls,
+                               parse_float,
+                               parse_int,
+                               object_hook,
+                               object_pairs_hook,
+                               record_types,
+                               schema).decode
+    buf = bytearray()
+    lineno = 1
+    while True:
+        chunk = await _read(reader, read_size)
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+
+        if chunk:
+            start = len(buf)
+            buf += chunk
+            end = buf.rfind(b'\n', start)
+            if end < 0:
+                continue
+            lines = buf[:end].split(b'\n')
+            del buf[:end + 1]
+        else:
+            # The rest after the last newline, if any
+            lines = [buf] if buf else []
+
+        for obj in _util.decode_lines(lines, decode, skip_empty, lineno):
+            yield obj
+        lineno += len(lines)
+
+        if not chunk:
+            return
+
+
+async def adump(obj, writer, *, buffer_size=kim_edn.BUFFER_SIZE, **kw):
+    r"""Serialize ``obj`` as KIM-EDN to the stream ``writer``.
+
+    ``writer`` supports ``writer.write(data)`` of UTF-8 encoded ``bytes``,
+    and ``await writer.drain()``. If ``write`` returns an awaitable, as for
+    ``aiohttp`` responses, it is awaited instead of ``drain``.
+
+    The output is written in pieces of about ``buffer_size`` characters,
+    waiting after each of them until the writer has room for more, and is
+    followed by a newline as in ``dump``. The other arguments are the
+    options of ``KIMEDNEncoder``, and have the same meaning as in
+    ``dump``; ``cls`` is a custom ``KIMEDNEncoder`` subclass.
+
+    """
+    cls = kw.pop('cls', None)
+    if cls is None and not kw:
+        encoder = _util.default_encoder
+    else:
+        encoder = (cls or kim_edn.KIMEDNEncoder)(**kw)
+
+    chunks = _util.buffered(encoder.iterencode(obj), buffer_size)
+    for data in chunks:
+        await _write(writer, data.encode('utf-8'))
+    await _write(writer, b'\n')
+
+
+async def _write(writer, data):
+    """Write ``data`` to ``writer``, and wait until it has room for more."""
+    result = writer.write(data)
+    if inspect.isawaitable(result):
+        await result
+    else:
+        await writer.drain()
@@ -0,0 +1,161 @@
+"""KIM-EDN to JSON bridge.
+
+Rewrite KIM-EDN text into JSON text in one pass, inserting the separators
+and dropping the comments, so that it can be decoded by the C-accelerated
+scanner of the standard ``json`` module.
+
+Only the documents which the pure-Python decoder reads the same way are
+rewritten. Anything else, including every malformed document, is handed
+back to the pure-Python decoder, which is the reference for the results
+and for the error messages and positions.
+"""
+import json
+import re
+
+__all__ = ['to_json', 'loads']
+
+FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
+
+_WS = r'[, \t\n\r]'
+# An atom not directly followed by another atom character
+_END = r'(?![^, \t\n\r;"\[\]{}:])'
+_NUMBER = r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?' + _END
+
+# The tokens, a run of whitespace-separated numbers being one token. Text
+# which is not a token, such as an unterminated string, is skipped.
+TOKEN = re.compile(rf"""
+    "[^"\\]*(?:\\.[^"\\]*)*"
+  | {_WS}+
+  | [\[\]{{}}:]
+  | {_NUMBER}(?:{_WS}+{_NUMBER})*
+  | (?:true|false){_END}
+  | ;[^\n]*
+""", FLAGS)
+WHITESPACE = re.compile(r'[, \t\n\r]+', FLAGS)
+
+# Control characters the decoder rejects anywhere
+CONTROL = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+WHITESPACE_STR = ', \t\n\r'
+
+# States of a map: expecting a key, right after a key, after the key and
+# whitespace (where a ':' may come), and expecting the value
+_EXPECT_KEY, _AFTER_KEY, _BEFORE_VALUE, _EXPECT_VALUE = range(4)
+
+
+class Unsupported(ValueError):
+    """The document is not rewritten into JSON."""
+
+
+def to_json(s):
+    """Return the JSON text of the KIM-EDN document ``s``.
+
+    Raise ``Unsupported`` if ``s`` is malformed, or if the pure-Python
+    decoder would not read its JSON text the same way.
+    """
+    if CONTROL.search(s) is not None:
+        raise Unsupported('control character')
+
+    tokens = TOKEN.findall(s)
+    if sum(map(len, tokens)) != len(s):
+        raise Unsupported('invalid token')
+
+    search_ws = WHITESPACE.search
+    sub_ws = WHITESPACE.sub
+    chunks = []
+    append = chunks.append
+
+    # One [is_map, count, state] per open container
+    stack = []
+    top = None
+    done = False
+
+    for token in tokens:
+        c = token[0]
+
+        if c in WHITESPACE_STR:
+            if top is not None and top[2] == _AFTER_KEY:
+                top[2] = _BEFORE_VALUE
+            continue
+
+        if c == ';':
+            if top is None:
+                if done:
+                    raise Unsupported('comment after the document')
+            elif top[0]:
+                if top[2] == _AFTER_KEY:
+                    raise Unsupported('comment right after a key')
+                if top[2] == _BEFORE_VALUE:
+                    top[2] = _EXPECT_VALUE
+            continue
+
+        if c in ']}:':
+            if top is None:
+                raise Unsupported(c)
+            if c == ':':
+                if not top[0] or top[2] not in (_AFTER_KEY, _BEFORE_VALUE):
+                    raise Unsupported(c)
+                top[2] = _EXPECT_VALUE
+                continue
+            if top[0] != (c == '}') or (top[0] and top[2] != _EXPECT_KEY):
+                raise Unsupported(c)
+            append(c)
+            stack.pop()
+            top = stack[-1] if stack else None
+            continue
+
+        # A value, or a run of numbers in a vector
+        if c != '"' and c not in '[{tf' and search_ws(token) is not None:
+            if top is None or top[0]:
+                raise Unsupported('numbers')
+            token = sub_ws(',', token)
+
+        if top is None:
+            if done:
+                raise Unsupported('extra data')
+            done = True
+        elif not top[0]:
+            if top[1]:
+                token = ',' + token
+            top[1] += 1
+        elif top[2] == _EXPECT_KEY:
+            if c != '"':
+                raise Unsupported('key')
+            if top[1]:
+                # The decoder skips the whitespace starting the later keys
+                if token[1] in WHITESPACE_STR:
+                    raise Unsupported('key')
+                token = ',' + token
+            top[2] = _AFTER_KEY
+        elif top[2] == _AFTER_KEY:
+            raise Unsupported('value right after a key')
+        else:
+            token = ':' + token
+            top[1] += 1
+            top[2] = _EXPECT_KEY
+
+        append(token)
+        if c in '[{':
+            top = [c == '{', 0, _EXPECT_KEY]
+            stack.append(top)
+
+    if stack or not done:
+        raise Unsupported('incomplete document')
+
+    return ''.join(chunks)
+
+
+def loads(s, fallback, **kw):
+    """Decode the KIM-EDN document ``s`` with the ``json`` module.
+
+    ``kw`` are the hooks passed to ``json.loads``. If ``s`` cannot be
+    decoded this way, return ``fallback(s)`` instead.
+    """
+    try:
+        text = to_json(s)
+    except Unsupported:
+        return fallback(s)
+
+    try:
+        return json.loads(text, strict=False, **kw)
+    except json.JSONDecodeError:
+        return fallback(s)
@@ -0,0 +1,302 @@
+"""Caches of decoded KIM-EDN files."""
+import collections
+import copy
+import hashlib
+import io
+import marshal
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+import kim_edn
+
+__all__ = ['DocumentCache', 'DiskCache']
+
+
+class DocumentCache(object):
+    """Least recently used cache of decoded KIM-EDN files.
+
+    ``load`` decodes a file once, and then returns the cached result for as
+    long as the file keeps the same modification time and size. Each call
+    returns a new copy of the result, so callers may modify it without
+    corrupting the cache.
+
+    The cache holds at most ``maxsize`` files, and about ``maxbytes`` bytes
+    of cached results. The least recently used files are evicted first.
+
+    ``hits`` and ``misses`` count the calls to ``load`` which found, or did
+    not find, an up-to-date result in the cache. The cache may be shared by
+    many threads.
+
+    """
+
+    def __init__(self, maxsize=128, maxbytes=64 << 20):
+        """KIM-EDN DocumentCache constructor."""
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached files."""
+        return len(self._entries)
+
+    def clear(self):
+        """Empty the cache and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.nbytes = 0
+
+    def load(self, path, *, cls=None, parse_float=None, parse_int=None,
+             object_hook=None, object_pairs_hook=None, record_types=None,
+             schema=None, disk_cache=None):
+        r"""Return the decoded KIM-EDN file ``path``.
+
+        The arguments have the same meaning as in ``kim_edn.load``, and
+        except ``disk_cache`` are part of the cache key. If ``path`` does
+        not name a regular file, it is passed on to ``kim_edn.load`` without
+        caching.
+
+        """
+        kw = dict(cls=cls, parse_float=parse_float, parse_int=parse_int,
+                  object_hook=object_hook,
+                  object_pairs_hook=object_pairs_hook,
+                  record_types=record_types,
+                  schema=schema)
+
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            st = None
+
+        if st is None or not stat.S_ISREG(st.st_mode):
+            return kim_edn.load(path, **kw)
+
+        key = (os.path.realpath(path), cls, parse_float, parse_int,
+               object_hook, object_pairs_hook,
+               tuple(record_types.items()) if record_types else None,
+               kim_edn.dumps(schema, sort_keys=True)
+               if isinstance(schema, dict) else schema)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _thaw(entry[1])
+
+            self.misses += 1
+
+        obj = kim_edn.load(path, disk_cache=disk_cache, **kw)
+        frozen, nbytes = _freeze(obj, st.st_size)
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.nbytes -= entry[2]
+
+            if nbytes <= self.maxbytes and self.maxsize > 0:
+                self._entries[key] = (stamp, frozen, nbytes)
+                self.nbytes += nbytes
+
+                while (len(self._entries) > self.maxsize
+                       or self.nbytes > self.maxbytes):
+                    self.nbytes -= self._entries.popitem(last=False)[1][2]
+
+        return _thaw(frozen)
+
+
+class DiskCache(object):
+    """Directory of binary copies of decoded KIM-EDN files.
+
+    ``load`` stores the decoded file in ``directory`` in the ``marshal``
+    format, named after the SHA-256 hash of the file content, the Python
+    version and the format version. A later load of a file with the same
+    content, by this or another process, reads the binary copy instead of
+    decoding the text. A modified file gets a new entry; the old one is
+    stale, and ``prune`` removes it once it is unused for ``max_age``
+    seconds or the directory grows over ``max_bytes`` bytes. ``prune`` runs
+    once ``max_bytes // 16`` bytes have been stored since the last run, or
+    when no process has run it for ``PRUNE_INTERVAL`` seconds.
+
+    Only the default decoding, without ``cls`` or hooks, is cached.
+
+    """
+
+    # Bumped when the stored object changes for the same text
+    FORMAT_VERSION = 2
+    SUFFIX = '.marshal'
+    # The file whose modification time is the time of the last prune
+    STAMP = 'pruned'
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, directory, max_bytes=256 << 20, max_age=30 * 86400):
+        """KIM-EDN DiskCache constructor."""
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._stored = 0
+        self._tag = (f'-{sys.implementation.cache_tag}'
+                     f'-m{marshal.version}-f{self.FORMAT_VERSION}')
+
+    def load(self, path):
+        """Return the decoded KIM-EDN file ``path``.
+
+        The file is read in text mode with the default encoding, like
+        ``kim_edn.load`` does, and the encoding is part of the hash.
+        """
+        with open(path, 'rb') as fo:
+            b = fo.read()
+
+        text = io.TextIOWrapper(io.BytesIO(b))
+        digest = hashlib.sha256(b)
+        digest.update(b'\0' + text.encoding.encode())
+        entry = os.path.join(self.directory,
+                             digest.hexdigest() + self._tag + self.SUFFIX)
+
+        try:
+            with open(entry, 'rb') as fo:
+                obj = marshal.loads(fo.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            self.hits += 1
+            try:
+                # Mark the entry as used, for prune
+                os.utime(entry)
+            except OSError:
+                pass
+            return obj
+
+        self.misses += 1
+        obj = kim_edn.loads(text.read())
+        self._store(entry, marshal.dumps(obj))
+        return obj
+
+    def _store(self, entry, data):
+        """Write ``data`` to the file ``entry`` atomically."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        except OSError:
+            # A read-only cache is still used for reading
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as fo:
+                fo.write(data)
+            os.replace(tmp, entry)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+
+        self._stored += len(data)
+        if self._stored > self.max_bytes // 16 or self._prune_due():
+            self.prune()
+
+    def _prune_due(self):
+        """Return whether no process has pruned for ``PRUNE_INTERVAL``."""
+        try:
+            st = os.stat(os.path.join(self.directory, self.STAMP))
+        except OSError:
+            return True
+        return time.time() - st.st_mtime > self.PRUNE_INTERVAL
+
+    def prune(self):
+        """Remove the stale and the least recently used entries.
+
+        Remove the entries of other Python or format versions, the entries
+        unused for ``max_age`` seconds, and then the least recently used
+        entries until the directory holds at most ``max_bytes`` bytes.
+        Return the number of bytes removed.
+
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+        self._stored = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+
+        try:
+            stamp = os.path.join(self.directory, self.STAMP)
+            with open(stamp, 'ab'):
+                pass
+            os.utime(stamp)
+        except OSError:
+            pass
+
+        for name in names:
+            if not name.endswith((self.SUFFIX, '.tmp')):
+                continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            stale = now - st.st_mtime > self.max_age
+            if name.endswith('.tmp'):
+                # Left over by an interrupted write
+                stale = now - st.st_mtime > 3600
+            elif not name.endswith(self._tag + self.SUFFIX):
+                stale = True
+
+            if stale:
+                removed += _remove(path, st.st_size)
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+
+        nbytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if nbytes <= self.max_bytes:
+                break
+            nbytes -= size
+            removed += _remove(path, size)
+
+        return removed
+
+
+def _remove(path, size):
+    """Remove the file ``path`` and return its size, or 0 on failure."""
+    try:
+        os.remove(path)
+    except OSError:
+        return 0
+    return size
+
+
+def _freeze(obj, size):
+    """Return the cached form of ``obj`` and its approximate size."""
+    try:
+        data = marshal.dumps(obj)
+    except ValueError:
+        # Objects made by the hooks, which marshal does not support, are
+        # copied instead, and their size estimated from the file size
+        return (False, obj), size
+
+    return (True, data), len(data)
+
+
+def _thaw(frozen):
+    """Return a new copy of the cached object."""
+    marshalled, data = frozen
+    if marshalled:
+        return marshal.loads(data)
+
+    return copy.deepcopy(data)
@@ -0,0 +1,300 @@
+r"""Compact binary format of KIM-EDN data.
+
+The compact format stores the KIM-EDN data model, maps, vectors, strings,
+integers, floats and booleans, in a binary form which is read back without
+scanning any text. ``loadb_compact(dumpb_compact(obj)) == obj`` and, for
+the objects decoded from a KIM-EDN document, ``dumps`` of the result gives
+the same text as ``dumps`` of the original.
+
+Layout, version 1
+-----------------
+
+A file is the 4 bytes ``b'KEDC'``, one version byte, and one value.
+
+A value is a one byte tag followed by its data::
+
+    T               true
+    F               false
+    i <int64>       integer in [-2**63, 2**63)
+    I <n> <bytes>   other integer, n bytes of two's complement
+    d <float64>     float
+    s <string>      string
+    [ <n> <value>*  vector of n values
+    { <n> (<string> <value>)*
+                    map of n keys and values
+    D <n> <float64>*
+                    vector of n floats
+    Q <n> <int64>*  vector of n integers
+
+Fixed-size numbers are little-endian. Counts and lengths ``<n>`` are
+unsigned LEB128 varints.
+
+Strings are numbered in the order they first appear. A ``<string>`` is a
+varint ``m``; if ``m`` is odd, it is followed by ``m >> 1`` bytes of UTF-8
+text, which become the next string of the table, otherwise it refers to
+the string number ``m >> 1`` of the table. Repeated keys and values are
+stored once.
+"""
+from array import array
+from math import isfinite
+import struct
+import sys
+
+__all__ = ['dumpb_compact', 'loadb_compact']
+
+MAGIC = b'KEDC'
+VERSION = 1
+
+_SWAP = sys.byteorder != 'little'
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+
+(_TRUE, _FALSE, _INT, _BIGINT, _FLOAT, _STRING, _VECTOR, _MAP,
+ _FLOAT_RUN, _INT_RUN) = b'TFiIds[{DQ'
+
+
+def dumpb_compact(obj, *, check_circular=True):
+    r"""Serialize ``obj`` to the compact binary format, as ``bytes``.
+
+    ``obj`` is made of ``dict`` with ``str`` keys, ``list``, ``str``,
+    ``int``, ``float`` and ``bool``; other objects raise a ``TypeError``,
+    and non-finite floats a ``ValueError``.
+
+    Vectors made only of floats, or only of integers which fit in 64 bits,
+    are stored as packed runs of numbers.
+
+    If ``check_circular`` is false, then the circular reference check for
+    container types will be skipped and a circular reference will result
+    in an ``RecursionError`` (or worse).
+
+    """
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    append = out.append
+    extend = out.extend
+    pack_int = _INT64.pack
+    pack_float = _FLOAT64.pack
+    strings = {}
+    markers = {} if check_circular else None
+
+    def write_uint(n):
+        while n > 0x7f:
+            append(n & 0x7f | 0x80)
+            n >>= 7
+        append(n)
+
+    def write_str(s):
+        idx = strings.get(s)
+        if idx is not None:
+            write_uint(idx << 1)
+            return
+
+        strings[s] = len(strings)
+        data = s.encode('utf-8', 'surrogatepass')
+        write_uint(len(data) << 1 | 1)
+        extend(data)
+
+    def write_float(o):
+        if not isfinite(o):
+            raise ValueError(
+                f"Out of range float values are not KIM-EDN compliant: {repr(o)}")
+        append(_FLOAT)
+        extend(pack_float(o))
+
+    def write_run(o):
+        """Write ``o`` as a run of numbers, and return whether it was."""
+        t = type(o[0])
+        if t is float:
+            if not all(type(x) is float for x in o) \
+                    or not all(map(isfinite, o)):
+                return False
+            a = array('d', o)
+            tag = _FLOAT_RUN
+        elif t is int:
+            if not all(type(x) is int for x in o):
+                return False
+            try:
+                a = array('q', o)
+            except OverflowError:
+                return False
+            tag = _INT_RUN
+        else:
+            return False
+
+        if _SWAP:
+            a.byteswap()
+        append(tag)
+        write_uint(len(o))
+        extend(a.tobytes())
+        return True
+
+    def write(o):
+        if isinstance(o, str):
+            append(_STRING)
+            write_str(o)
+        elif o is True:
+            append(_TRUE)
+        elif o is False:
+            append(_FALSE)
+        elif isinstance(o, int):
+            if -0x8000000000000000 <= o <= 0x7fffffffffffffff:
+                append(_INT)
+                extend(pack_int(o))
+            else:
+                data = o.to_bytes(o.bit_length() // 8 + 1, 'little',
+                                  signed=True)
+                append(_BIGINT)
+                write_uint(len(data))
+                extend(data)
+        elif isinstance(o, float):
+            write_float(o)
+        elif isinstance(o, (list, dict)):
+            if markers is not None:
+                markerid = id(o)
+                if markerid in markers:
+                    raise ValueError("Circular reference detected")
+                markers[markerid] = o
+
+            if isinstance(o, dict):
+                append(_MAP)
+                write_uint(len(o))
+                for key, value in o.items():
+                    if not isinstance(key, str):
+                        raise TypeError(
+                            f'keys must be str, not {key.__class__.__name__}')
+                    write_str(key)
+                    write(value)
+            elif not o or not write_run(o):
+                append(_VECTOR)
+                write_uint(len(o))
+                for value in o:
+                    write(value)
+
+            if markers is not None:
+                del markers[markerid]
+        else:
+            raise TypeError(f'Object of type {o.__class__.__name__} '
+                            f'is not KIM-EDN serializable')
+
+    write(obj)
+    return bytes(out)
+
+
+def loadb_compact(b):
+    r"""Deserialize ``b`` from the compact binary format.
+
+    ``b`` is a ``bytes``, ``bytearray``, ``memoryview`` or other object
+    supporting the buffer protocol. Strings and runs of numbers are read
+    from slices of a ``memoryview``, without copying ``b``.
+
+    Raise a ``ValueError`` if ``b`` is not valid compact data.
+
+    """
+    mv = memoryview(b).cast('B')
+    size = len(mv)
+    if mv[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not KIM-EDN compact data')
+    if size <= len(MAGIC) or mv[len(MAGIC)] != VERSION:
+        raise ValueError('Unsupported KIM-EDN compact data version')
+
+    unpack_int = _INT64.unpack_from
+    unpack_float = _FLOAT64.unpack_from
+    strings = []
+
+    def read_uint(pos):
+        n = shift = 0
+        while True:
+            c = mv[pos]
+            pos += 1
+            n |= (c & 0x7f) << shift
+            if c < 0x80:
+                return n, pos
+            shift += 7
+
+    def read_slice(pos, n):
+        end = pos + n
+        if end > size:
+            raise IndexError
+        return mv[pos:end], end
+
+    def read_str(pos):
+        n = mv[pos]
+        if n < 0x80:
+            pos += 1
+        else:
+            n, pos = read_uint(pos)
+        if not n & 1:
+            return strings[n >> 1], pos
+
+        data, pos = read_slice(pos, n >> 1)
+        s = str(data, 'utf-8', 'surrogatepass')
+        strings.append(s)
+        return s, pos
+
+    def read(pos):
+        tag = mv[pos]
+        pos += 1
+
+        if tag == _MAP:
+            n, pos = read_uint(pos)
+            obj = {}
+            for _ in range(n):
+                # Most keys are references to the string table
+                m = mv[pos]
+                if m < 0x80 and not m & 1:
+                    key = strings[m >> 1]
+                    pos += 1
+                else:
+                    key, pos = read_str(pos)
+                obj[key], pos = read(pos)
+            return obj, pos
+
+        if tag == _VECTOR:
+            n, pos = read_uint(pos)
+            obj = []
+            append = obj.append
+            for _ in range(n):
+                value, pos = read(pos)
+                append(value)
+            return obj, pos
+
+        if tag == _FLOAT_RUN or tag == _INT_RUN:
+            n, pos = read_uint(pos)
+            data, pos = read_slice(pos, 8 * n)
+            a = array('d' if tag == _FLOAT_RUN else 'q')
+            a.frombytes(data)
+            if _SWAP:
+                a.byteswap()
+            return a.tolist(), pos
+
+        if tag == _STRING:
+            return read_str(pos)
+
+        if tag == _FLOAT:
+            return unpack_float(mv, pos)[0], pos + 8
+
+        if tag == _INT:
+            return unpack_int(mv, pos)[0], pos + 8
+
+        if tag == _TRUE:
+            return True, pos
+
+        if tag == _FALSE:
+            return False, pos
+
+        if tag == _BIGINT:
+            n, pos = read_uint(pos)
+            data, pos = read_slice(pos, n)
+            return int.from_bytes(data, 'little', signed=True), pos
+
+        raise ValueError(f'Unknown tag {tag!r} at byte {pos - 1}')
+
+    try:
+        obj, pos = read(len(MAGIC) + 1)
+    except (IndexError, struct.error):
+        raise ValueError('Truncated KIM-EDN compact data') from None
+
+    if pos != size:
+        raise ValueError(f'Extra data at byte {pos}')
+
+    return obj
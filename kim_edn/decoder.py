@@ -1,4 +1,6 @@
 """Implementation of KIMEDNDecoder."""
+import keyword
+import operator
 import re
 
 from kim_edn import scanner
@@ -167,8 +169,8 @@ STRIP_COMMENT = re.compile(r'[;][^\n]*')
 
 
 def KIMEDNObject(s_and_end, strict, scan_once, object_hook, object_pairs_hook,
-                 memo=None, _w=WHITESPACE.match, _ws=WHITESPACE_STR,
-                 _sc=STRIP_COMMENT.search):
+                 memo=None, check=None, _w=WHITESPACE.match,
+                 _ws=WHITESPACE_STR, _sc=STRIP_COMMENT.search):
     s, end = s_and_end
 
     pairs = []
@@ -233,11 +235,16 @@ def KIMEDNObject(s_and_end, strict, scan_once, object_hook, object_pairs_hook,
         except IndexError:
             pass
 
+        start = end
         try:
             value, end = scan_once(s, end)
         except StopIteration as err:
             raise KIMEDNDecodeError("Expecting value", s, err.value) from None
 
+        # Checks each pair as soon as it is decoded, see SchemaDecoder
+        if check is not None:
+            check(key, value, start)
+
         pairs_append((key, value))
 
         try:
@@ -332,6 +339,139 @@ def KIMEDNArray(s_and_end, scan_once, _w=WHITESPACE.match,
     return values, end
 
 
+def _make_record_hook(record_types, object_hook, object_pairs_hook,
+                      _id='property-id', _max_shapes=1024):
+    """Return an ``object_pairs_hook`` building the maps of ``record_types``.
+
+    The maps which match no record type are passed to ``object_pairs_hook``
+    or ``object_hook``, or made into a ``dict``.
+    """
+    by_id = {}
+    by_keys = {}
+    for key, cls in record_types.items():
+        if isinstance(key, str):
+            by_id[key] = cls
+        else:
+            by_keys[frozenset(key)] = cls
+
+    # The record type, the index of the property-id and the builders of
+    # each record type of each sequence of keys
+    shapes = {}
+
+    def record_hook(pairs):
+        keys = tuple([pair[0] for pair in pairs])
+        shape = shapes.get(keys)
+        if shape is None:
+            if len(shapes) >= _max_shapes:
+                shapes.clear()
+            shape = shapes[keys] = (
+                by_keys.get(frozenset(keys)),
+                keys.index(_id) if by_id and _id in keys else -1,
+                {})
+
+        cls, id_index, builders = shape
+        if id_index >= 0:
+            property_id = pairs[id_index][1]
+            if isinstance(property_id, str):
+                cls = by_id.get(property_id, cls)
+
+        if cls is not None:
+            build = builders.get(cls)
+            if build is None:
+                build = builders[cls] = _make_record_builder(cls, keys)
+            return build([pair[1] for pair in pairs])
+
+        if object_pairs_hook is not None:
+            return object_pairs_hook(pairs)
+
+        if object_hook is not None:
+            return object_hook(dict(pairs))
+
+        return dict(pairs)
+
+    return record_hook
+
+
+def _make_record_builder(cls, keys, _missing=object()):
+    """Return a function building ``cls`` from the values of ``keys``.
+
+    The keys are matched with the fields of ``cls`` once, so the records are
+    built from positional arguments, or with ``_make`` for namedtuples.
+    Types whose fields are not known are called with keyword arguments.
+    """
+    names = []
+    for key in keys:
+        name = key.replace('-', '_')
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise TypeError(f"cannot build {cls.__name__} from the key "
+                            f"{key!r}, which is not a valid field name once "
+                            f"'-' is replaced by '_'")
+        names.append(name)
+
+    fields = getattr(cls, '_fields', None)
+    if isinstance(fields, tuple) and hasattr(cls, '_make'):
+        defaults = getattr(cls, '_field_defaults', {})
+        fields = [(field, defaults.get(field, _missing)) for field in fields]
+        make = cls._make
+    else:
+        import inspect
+        try:
+            parameters = inspect.signature(cls).parameters.values()
+        except (TypeError, ValueError):
+            parameters = None
+
+        if parameters is None or any(
+                p.kind in (p.KEYWORD_ONLY, p.VAR_KEYWORD) for p in parameters):
+            # Keyword-only fields, or fields taken by **kwargs
+            return lambda values: cls(**dict(zip(names, values)))
+
+        fields = [(p.name, _missing if p.default is p.empty else p.default)
+                  for p in parameters
+                  if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+
+        make = None
+
+    index = {name: i for i, name in enumerate(names)}
+    order = []
+    extra = []
+    for field, default in fields:
+        i = index.pop(field, None)
+        if i is None:
+            if default is _missing:
+                raise TypeError(f'cannot build {cls.__name__} from the keys '
+                                f'{list(keys)}, its field {field!r} is '
+                                f'missing')
+            i = len(names) + len(extra)
+            extra.append(default)
+        order.append(i)
+
+    if index:
+        raise TypeError(f'cannot build {cls.__name__} from the keys '
+                        f'{list(keys)}, it has no field {next(iter(index))!r}')
+
+    if order == list(range(len(order))) and not extra:
+        def args(values):
+            return values
+    elif len(order) == 1:
+        # itemgetter of one item does not return a tuple
+        def args(values, _i=order[0]):
+            if extra:
+                values += extra
+            return (values[_i], )
+    else:
+        getter = operator.itemgetter(*order)
+
+        def args(values):
+            if extra:
+                values += extra
+            return getter(values)
+
+    if make is not None:
+        return lambda values: make(args(values))
+
+    return lambda values: cls(*args(values))
+
+
 class KIMEDNDecoder(object):
     """A KIM-EDN decoder (KIMEDNDecoder) object.
 
@@ -357,7 +497,7 @@ class KIMEDNDecoder(object):
     """
 
     def __init__(self, *, parse_float=None, parse_int=None, strict=True,
-                 object_hook=None, object_pairs_hook=None):
+                 object_hook=None, object_pairs_hook=None, record_types=None):
         r"""KIM-EDN decoder (KIMEDNDecoder) constructor.
 
         ``parse_float``, if specified, will be called with the string of every
@@ -386,6 +526,19 @@ class KIMEDNDecoder(object):
         If ``object_hook`` is also defined, the ``object_pairs_hook``
         takes priority.
 
+        ``record_types``, if specified, is a mapping of the KIM-EDN objects
+        to decode into other types, such as ``__slots__`` classes,
+        dataclasses or namedtuples. Its keys are either a ``'property-id'``
+        value, for the objects with this property id, or a ``frozenset`` of
+        keys, for the objects with exactly these keys; the property id takes
+        priority. A matching object is built directly from its values,
+        given to the fields named by the keys with ``'-'`` replaced by
+        ``'_'`` (``"source-value"`` becomes ``source_value``). The keys are
+        matched with the fields once for each sequence of keys, and a
+        ``TypeError`` is raised if they do not match.
+        The other objects are passed to ``object_pairs_hook`` or
+        ``object_hook`` as usual.
+
         """
         self.parse_string = py_scanstring
         self.parse_object = KIMEDNObject
@@ -395,6 +548,12 @@ class KIMEDNDecoder(object):
         self.strict = strict
         self.object_hook = object_hook
         self.object_pairs_hook = object_pairs_hook
+        self.record_types = record_types
+        if record_types:
+            self.object_pairs_hook = _make_record_hook(record_types,
+                                                       object_hook,
+                                                       object_pairs_hook)
+        # Kept for backwards compatibility, the scanner has a memo per call
         self.memo = {}
 
         self.scan_once = scanner.make_scanner(self)
@@ -1,4 +1,8 @@
 """Implementation of KIMEDNEncoder."""
+from collections import abc
+import functools
+import itertools
+import operator
 import re
 
 ESCAPE_ASCII = re.compile(r'([\\"]|[^\ -~])')
@@ -16,8 +20,36 @@ for _i in range(0x20):
     ESCAPE_DCT.setdefault(chr(_i), '\\u{0:04x}'.format(_i))
 del _i
 
+# The format specs of float_format, without fill, width, sign or grouping
+FLOAT_FORMAT_SPEC = re.compile(r'(?:\.\d+)?[eEfFgG]?')
+
 INFINITY = float('inf')
 
+# With sort_keys, maps with at least SORT_CACHE_MIN_KEYS keys take their key
+# order from a bounded (LRU) cache keyed on the tuple of keys. Smaller maps are
+# cheaper to sort than to look up.
+SORT_CACHE_MIN_KEYS = 16
+SORT_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=SORT_CACHE_SIZE)
+def _sorted_keys_getter(keys):
+    """Return a getter picking the items of the ``keys`` tuple in sorted order.
+
+    Keys that compare equal but are written differently (``1``, ``1.0`` and
+    ``True``) share a cache entry, so the cache stores positions, not keys.
+
+    """
+    return operator.itemgetter(*sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def _sorted_items(dct, _sort_cache_min_keys=SORT_CACHE_MIN_KEYS):
+    """Return the items of the map ``dct``, sorted by key."""
+    if len(dct) < _sort_cache_min_keys:
+        return sorted(dct.items())
+
+    return _sorted_keys_getter(tuple(dct))(tuple(dct.items()))
+
 
 def encode_basestring_ascii(s):
     """Return an ASCII-only KIM-EDN representation of a Python string."""
@@ -38,6 +70,51 @@ def encode_basestring_ascii(s):
     return '"' + ESCAPE_ASCII.sub(replace, s) + '"'
 
 
+def _make_floatrepr(float_format=None):
+    """Return a function formatting a finite float as a KIM-EDN number.
+
+    ``float_format`` may be None (``float.__repr__``, the shortest string
+    that round-trips), a format spec of type e, E, f, F, g or G with an
+    optional precision, such as ``'.8g'``, a number of significant digits,
+    or a callable taking a float and returning its KIM-EDN text.
+
+    """
+    if float_format is None:
+        return float.__repr__
+
+    if callable(float_format):
+        return float_format
+
+    if isinstance(float_format, int) and not isinstance(float_format, bool):
+        if float_format < 1:
+            msg = 'the number of significant digits must be positive, '
+            msg += f'not {float_format}'
+            raise ValueError(msg)
+
+        float_format = f'.{float_format}g'
+    elif not isinstance(float_format, str):
+        msg = 'float_format must be a format spec, an int or a callable, '
+        msg += f'not {float_format.__class__.__name__}'
+        raise TypeError(msg)
+
+    # Other specs may add a sign, a fill, grouping separators or a '%',
+    # which KIM-EDN numbers do not have
+    if FLOAT_FORMAT_SPEC.fullmatch(float_format) is None:
+        msg = 'float_format must be a precision and a type among e, E, f, '
+        msg += f"F, g and G, such as '.8g', not {float_format!r}"
+        raise ValueError(msg)
+
+    def floatrepr(o, _format=format, _spec=float_format):
+        s = _format(o, _spec)
+        # A float formatted without a fraction or an exponent (e.g. 1.0 with
+        # 'g') would be decoded as an integer.
+        if s.lstrip('-').isdigit():
+            s += '.0'
+        return s
+
+    return floatrepr
+
+
 class KIMEDNEncoder(object):
     """KIM-EDN encoder (KIMEDNEncoder) for OpenKIM Python data structures.
 
@@ -62,13 +139,20 @@ class KIMEDNEncoder(object):
 
     """
 
-    def __init__(self, *, sort_keys=False, indent=None, default=None):
+    def __init__(self, *, check_circular=True, sort_keys=False, indent=None,
+                 default=None, float_format=None, validate_keys=True,
+                 stream_iterables=False):
         """KIM-EDN encoder (KIMEDNEncoder) constructor with sensible defaults.
 
         # NOTE:
         By default it is false (a TypeError) to attempt encoding of keys that
         are not str.
 
+        If check_circular is true, then lists, dicts, and custom encoded
+        objects will be checked for circular references during encoding to
+        prevent an infinite recursion (which would cause a RecursionError).
+        Otherwise, no such check takes place.
+
         If sort_keys is true, then the output of dictionaries will be
         sorted by key; this is useful for regression tests to ensure
         that KIM-EDN serializations can be compared on a day-to-day basis.
@@ -82,9 +166,35 @@ class KIMEDNEncoder(object):
         can't otherwise be serialized. It should return a KIM-EDN encodable
         version of the object or raise a ``TypeError``.
 
+        If specified, float_format controls how floats are written. It is a
+        format spec of type e, E, f, F, g or G with an optional precision
+        (e.g. ``'.8g'``), a number of significant digits, or a callable
+        returning the KIM-EDN text of a float. The default is
+        ``float.__repr__``, which round-trips exactly but may emit up to 17
+        significant digits. Out of range floats are rejected either way.
+
+        If validate_keys is true, ``int``, ``float`` and ``bool`` keys are
+        converted to strings and any other key raises a ``TypeError``. If
+        false, the key conversion is skipped; every key must then be a
+        ``str``, and the result for any other key is undefined.
+
+        If stream_iterables is true, any other iterable object (a generator,
+        ``map``, ``itertools.chain``, ``tuple``, ...) except ``bytes``,
+        ``bytearray``, mappings and sets is encoded as a vector, item by
+        item, instead of being passed to default. With ``iterencode`` or
+        ``dump``, only one item of such an iterable is held at a time.
+
+        ``check_circular=False, validate_keys=False`` is the trusted-input
+        profile, for acyclic data built from known-good types. It drops the
+        per-container bookkeeping of the default encoder.
+
         """
+        self.check_circular = check_circular
+        self.validate_keys = validate_keys
+        self.stream_iterables = stream_iterables
         self.sort_keys = sort_keys
         self.indent = indent
+        self.float_format = float_format
         if default is not None:
             self.default = default
 
@@ -161,30 +271,253 @@ class KIMEDNEncoder(object):
         }
 
         """
-        markers = {}
+        return self._iterencoder()(o, 0)
+
+    def record_encoder(self, shape):
+        """Return a function encoding maps of a fixed shape to a KIM-EDN string.
+
+        ``shape`` is an example map, or a map of each key to the type of its
+        value (``str``, ``int``, ``float``, ``bool``, ``list`` or ``dict``).
+        The keys are escaped, and the text between values is laid out, once.
+        Encoding a matching map then only formats its values. A map matches if
+        it is a ``dict`` with the same keys (in the same order, unless
+        sort_keys is true) and values of exactly the same types. Values given
+        as example maps are compiled the same way. Anything that does not
+        match is encoded by the general encoder, so the result is always
+        identical to ``encode``.
+
+        For example,
+
+        >>> encode = KIMEDNEncoder().record_encoder({"instance-id": int, "species": str})
+        >>> encode({"instance-id": 1, "species": "Al"})
+        '{"instance-id" 1 "species" "Al"}'
+
+        """
+        if self.indent is not None:
+            raise ValueError('record encoders write compact KIM-EDN, '
+                             'indent must be None')
+
+        # Each call takes an iterencoder, with its own circular reference
+        # markers, from the pool, so that the encoder may be used by many
+        # threads at once, or again from ``default``
+        pool = [self._iterencoder()]
+
+        def encode_value(o):
+            if isinstance(o, str):
+                return encode_basestring_ascii(o)
+
+            try:
+                _iterencode = pool.pop()
+            except IndexError:
+                _iterencode = self._iterencoder()
+
+            # After an error, the markers left behind are dropped with the
+            # iterencoder
+            chunks = ''.join(_iterencode(o, 0))
+            pool.append(_iterencode)
+            return chunks
+
+        return _make_record_encoder(shape,
+                                    self.sort_keys,
+                                    _make_floatstr(_make_floatrepr(self.float_format)),
+                                    encode_value)
+
+    def _iterencoder(self):
+        """Return the ``_iterencode(o, _current_indent_level)`` generator."""
+        if self.check_circular:
+            markers = {}
+        else:
+            markers = None
 
-        def floatstr(o, _repr=float.__repr__):
-            # Check for specials.  Note that this type of test is processor
-            # and/or platform-specific, so do tests which don't depend on the
-            # internals.
+        floatrepr = _make_floatrepr(self.float_format)
 
-            if o != o or o == INFINITY or o == -INFINITY:
-                raise ValueError(
-                    f"Out of range float values are not KIM-EDN compliant: {repr(o)}")
+        return _make_iterencode(markers,
+                                self.default,
+                                encode_basestring_ascii,
+                                self.indent,
+                                _make_floatstr(floatrepr),
+                                self.sort_keys,
+                                floatrepr,
+                                self.validate_keys,
+                                self.stream_iterables)
 
-            return _repr(o)
 
-        _iterencode = _make_iterencode(markers,
-                                       self.default,
-                                       encode_basestring_ascii,
-                                       self.indent,
-                                       floatstr,
-                                       self.sort_keys)
+def _make_floatstr(floatrepr):
+    def floatstr(o, _repr=floatrepr):
+        # Check for specials.  Note that this type of test is processor
+        # and/or platform-specific, so do tests which don't depend on the
+        # internals.
 
-        return _iterencode(o, 0)
+        if o != o or o == INFINITY or o == -INFINITY:
+            raise ValueError(
+                f"Out of range float values are not KIM-EDN compliant: {repr(o)}")
+
+        return _repr(o)
+
+    return floatstr
+
+
+def _make_record_encoder(shape, sort_keys, floatstr, encode_value,
+                         _boolstr={True: 'true', False: 'false'}.__getitem__):
+    if not isinstance(shape, dict) or not shape:
+        msg = 'the record shape must be a non-empty dict, '
+        msg += f'not {shape!r}'
+        raise TypeError(msg)
+
+    keys = tuple(shape)
+    if sort_keys:
+        keys = tuple(sorted(keys))
+
+    keyset = frozenset(keys)
+    types = []
+    formatters = []
+    template = []
+    for key in keys:
+        if not isinstance(key, str):
+            msg = 'the record shape keys must be `str`, '
+            msg += f'not {key.__class__.__name__}'
+            raise TypeError(msg)
+
+        value = shape[key]
+        kind = value if isinstance(value, type) else type(value)
+        if kind is str:
+            formatter = encode_basestring_ascii
+        elif kind is bool:
+            formatter = _boolstr
+        elif kind is int:
+            formatter = int.__repr__
+        elif kind is float:
+            formatter = floatstr
+        elif kind is dict and value and value is not dict:
+            formatter = _make_record_encoder(value, sort_keys, floatstr,
+                                             encode_value)
+        else:
+            formatter = encode_value
+
+        types.append(kind)
+        formatters.append(formatter)
+        template.append(encode_basestring_ascii(key).replace('%', '%%') + ' %s')
+
+    types = tuple(types)
+    formatters = tuple(formatters)
+    template = '{' + ' '.join(template) + '}'
+
+    if len(keys) == 1:
+        key = keys[0]
+
+        def getvalues(o):
+            return o[key],
+    else:
+        getvalues = operator.itemgetter(*keys)
+
+    def encode_record(o, _map=map, _tuple=tuple, _type=type, _zip=zip):
+        if (_type(o) is dict
+                and (o.keys() == keyset if sort_keys else _tuple(o) == keys)):
+            values = getvalues(o)
+            if _tuple(_map(_type, values)) == types:
+                return template % _tuple([formatter(value) for formatter, value
+                                          in _zip(formatters, values)])
+
+        return encode_value(o)
+
+    return encode_record
+
+
+def _numeric_items(vct, floatrepr, repr_floats,
+                   float=float,
+                   int=int,
+                   list=list,
+                   map=map,
+                   repr=repr,
+                   set=set,
+                   sum=sum,
+                   type=type,
+                   _intstr=int.__repr__,
+                   _numeric_types=frozenset((int, float)),
+                   ):
+    """Return the KIM-EDN text of every item of ``vct``, or None.
+
+    ``vct`` is a list, and only a list holding nothing but plain ``int`` and
+    ``float`` values is written at once; bool and int/float subclasses are
+    left to the per-item path.
+    """
+    types = set(map(type, vct))
+    if not types <= _numeric_types:
+        return None
+
+    if float in types:
+        # The sum of the items is finite only if every item is finite.
+        # Otherwise (or on a spurious overflow), the per-item path will
+        # find and report the offending value.
+        try:
+            total = sum(vct)
+        except OverflowError:
+            return None
+
+        if total != total or total == INFINITY or total == -INFINITY:
+            return None
+
+    if repr_floats or float not in types:
+        return list(map(repr, vct))
+
+    if int not in types:
+        return list(map(floatrepr, vct))
+
+    return [floatrepr(value) if type(value) is float else _intstr(value)
+            for value in vct]
+
+
+def _numeric_vect(vct, current_indent_level, indent, floatrepr, repr_floats):
+    """Return the KIM-EDN text of the vector ``vct`` of numbers, or None.
+
+    None is returned for anything but an empty vector or a list of plain
+    ``int`` and ``float`` values, such as a streamed iterable, which can be
+    iterated only once.
+    """
+    if not vct:
+        return '[]'
+
+    if not isinstance(vct, list):
+        return None
+
+    items = _numeric_items(vct, floatrepr, repr_floats)
+    if items is None:
+        return None
+
+    if indent is None:
+        return '[' + ' '.join(items) + ']'
+
+    newline_indent = '\n' + indent * (current_indent_level + 1)
+    return ('[' + newline_indent + (' ' + newline_indent).join(items)
+            + '\n' + indent * current_indent_level + ']')
+
+
+def _stream_items(o, stream_iterables, _chain=itertools.chain):
+    """Return the items of ``o`` to stream as a vector, or None.
+
+    None is returned unless ``stream_iterables`` is true, and if ``o`` is
+    not iterable, or is a mapping, which would lose its values, a set, which
+    would lose its order, or bytes.
+    """
+    if not stream_iterables or isinstance(
+            o, (bytes, bytearray, abc.Mapping, abc.Set)):
+        return None
+
+    try:
+        it = iter(o)
+    except TypeError:
+        return None
+
+    # An empty vector is written as '[]', so look ahead for a first item
+    for first in it:
+        return _chain((first,), it)
+
+    return ()
 
 
 def _make_iterencode(markers, _default, _encoder, _indent, _floatstr, _sort_keys,
+                     _floatrepr=float.__repr__, _validate_keys=True,
+                     _stream_iterables=False,
                      # HACK: hand-optimized bytecode; turn globals into locals
                      ValueError=ValueError,
                      dict=dict,
@@ -196,6 +529,9 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr, _sort_keys
                      id=id,
                      isinstance=isinstance,
                      _intstr=int.__repr__,
+                     _sorted_items=_sorted_items,
+                     _numeric_vect=_numeric_vect,
+                     _stream_items=_stream_items,
                      ):
     item_separator = ' '
     key_separator = ' '
@@ -203,10 +539,17 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr, _sort_keys
     if _indent is not None and not isinstance(_indent, str):
         _indent = ' ' * _indent
 
+    _repr_floats = _floatrepr is float.__repr__
+    _items = _sorted_items if _sort_keys else dict.items
+
     # Vectors (or "arrays") is a subset of KIM-EDN allowed is the KIM infrastructure
     def _iterencode_vect(vct, _current_indent_level):
-        if not vct:
-            yield '[]'
+        chunk = _numeric_vect(vct, _current_indent_level, _indent, _floatrepr,
+                              _repr_floats)
+        if chunk is not None:
+            # An empty vector or a vector of numbers can not be part of a
+            # circular reference, and is emitted as a single chunk.
+            yield chunk
             return
 
         if markers is not None:
@@ -291,13 +634,10 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr, _sort_keys
             separator = item_separator
 
         first = True
-        if _sort_keys:
-            items = sorted(dct.items())
-        else:
-            items = dct.items()
+        items = _items(dct)
 
         for key, value in items:
-            if isinstance(key, str):
+            if not _validate_keys or isinstance(key, str):
                 pass
             # JavaScript is weakly typed for these, so it makes sense to
             # also allow them.  Many encoders seem to do something like this.
@@ -381,9 +721,13 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr, _sort_keys
 
                 markers[markerid] = o
 
-            o = _default(o)
+            items = _stream_items(o, _stream_iterables)
+            if items is None:
+                o = _default(o)
 
-            yield from _iterencode(o, _current_indent_level)
+                yield from _iterencode(o, _current_indent_level)
+            else:
+                yield from _iterencode_vect(items, _current_indent_level)
 
             if markers is not None:
                 del markers[markerid]
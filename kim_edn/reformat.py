@@ -0,0 +1,248 @@
+"""Reformat KIM-EDN text from its token stream.
+
+The reformatter rewrites the whitespace and the indentation of KIM-EDN
+text without building Python objects. Strings and numbers are copied
+exactly as they appear in the input, and the memory use does not depend
+on the size of the document.
+"""
+import re
+
+from kim_edn.decoder import KIMEDNDecodeError, WHITESPACE_STR
+
+__all__ = ['reformat']
+
+FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
+TOKEN = re.compile(r"""
+    (?P<ws>[, \t\n\r]+)
+  | (?P<comment>;[^\n]*)
+  | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+  | (?P<atom>true|false|-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?)
+  | (?P<punct>[\[\]{}:])
+""", FLAGS)
+
+READ_SIZE = 1 << 16
+
+# What a map expects next
+KEY, COLON, VALUE = range(3)
+
+
+def reformat(infile, outfile, *, indent=None, strip_comments=False,
+             edn_lines=False, end='\n', read_size=READ_SIZE):
+    r"""Rewrite the KIM-EDN text of ``infile`` to ``outfile``.
+
+    ``infile`` is a text file-like object supporting ``.read()``, and
+    ``outfile`` one supporting ``.write()``.
+
+    The layout is the same as ``dump`` with the same ``indent``; with the
+    default ``indent=None`` the output is minified. Each document is
+    followed by ``end``. Comments are kept, on their own line or after the
+    item they follow, unless ``strip_comments`` is true.
+
+    If ``edn_lines`` is true, the input may hold any number of documents,
+    otherwise it must hold exactly one.
+
+    The structure of the input is checked, and a ``KIMEDNDecodeError`` is
+    raised on malformed input, but the content of strings is copied as is.
+    Its ``pos``, ``lineno`` and ``colno`` refer to the whole input, while
+    ``doc`` only holds the part of the input read last.
+
+    The structure follows the rules of ``loads``: values need no separator
+    and a number ends where it stops matching, so ``[01]`` holds two
+    numbers, and the character right after a key is skipped unless it is
+    whitespace. With ``edn_lines``, each document must fit on one line.
+
+    The input is read ``read_size`` characters at a time, and at most one
+    chunk of output is held in memory.
+    """
+    if indent is not None and not isinstance(indent, str):
+        indent = ' ' * indent
+
+    pretty = indent is not None
+    if not pretty:
+        indent = ''
+
+    match_token = TOKEN.match
+
+    # One [closer, count, expecting] per open container, expecting being
+    # KEY, COLON or VALUE for maps and None for vectors
+    stack = []
+    ndocs = 0
+    line_done = False
+    after_comment = False
+    newline_seen = False
+
+    buf = ''
+    eof = False
+    offset = 0
+    lineno = 1
+    colno = 1
+
+    def error(msg, idx):
+        # Report the position in the whole input, not in the buffer
+        err = KIMEDNDecodeError(msg, buf, idx)
+        nl = buf.rfind('\n', 0, idx)
+        err.pos = offset + idx
+        err.lineno = lineno + buf.count('\n', 0, idx)
+        err.colno = idx - nl if nl >= 0 else colno + idx
+        err.args = ('%s: line %d column %d (char %d)'
+                    % (msg, err.lineno, err.colno, err.pos), )
+        return err
+
+    def unclosed(idx):
+        top = stack[-1]
+        if top[2] is not None and top[2] != KEY:
+            return error('Expecting value', idx)
+        return error(f"Expecting '{top[0]}' delimiter", idx)
+
+    def value_prefix(idx, is_string):
+        """Return the text to write before a value starting at ``idx``."""
+        if not stack:
+            if line_done if edn_lines else ndocs:
+                raise error('Extra data', idx)
+            return ''
+
+        top = stack[-1]
+        depth = len(stack)
+        if top[2] is not None:
+            if top[2] != KEY:
+                return '\n' + indent * depth if after_comment else ' '
+            if not is_string:
+                raise error('Expecting property name enclosed in double '
+                            'quotes', idx)
+
+        if after_comment:
+            return '\n' + indent * depth
+        if not pretty:
+            return ' ' if top[1] else ''
+        return (' \n' if top[1] else '\n') + indent * depth
+
+    def value_done(pieces):
+        nonlocal ndocs, line_done
+        if not stack:
+            pieces.append(end)
+            ndocs += 1
+            line_done = True
+            return
+
+        top = stack[-1]
+        top[1] += 1
+        if top[2] is not None:
+            top[2] = KEY
+
+    read = infile.read
+    write = outfile.write
+
+    while not eof:
+        chunk = read(max(read_size, len(buf)))
+        if not chunk:
+            eof = True
+        buf += chunk
+
+        pieces = []
+        idx = 0
+        size = len(buf)
+        while idx < size:
+            m = match_token(buf, idx)
+            if m is None:
+                if buf[idx] == '"':
+                    if not eof:
+                        break
+                    raise error('Unterminated string starting at', idx)
+                # Wait for the rest of a number or of true or false
+                if not eof and size - idx < 5:
+                    break
+                if stack and stack[-1][2] == KEY:
+                    raise error('Expecting property name enclosed in double '
+                                'quotes', idx)
+                raise error('Expecting value', idx)
+
+            kind = m.lastgroup
+            token = m.group()
+            stop = m.end()
+
+            # A token which reaches the end of the buffer may go on in the
+            # next chunk, and a number may go on with a fraction or exponent
+            if not eof and kind != 'punct' \
+                    and stop + (2 if kind == 'atom' else 0) >= size:
+                break
+
+            if kind == 'ws':
+                if '\n' in token:
+                    newline_seen = True
+                    if edn_lines:
+                        if stack:
+                            raise unclosed(idx + token.index('\n'))
+                        line_done = False
+            elif kind == 'comment':
+                if not stack and (line_done if edn_lines else ndocs):
+                    raise error('Extra data', idx)
+                if stack and stack[-1][2] == COLON:
+                    stack[-1][2] = VALUE
+                if not strip_comments:
+                    if not stack:
+                        pieces.append(token + '\n')
+                    elif after_comment or newline_seen:
+                        pieces.append('\n' + indent * len(stack) + token)
+                    else:
+                        pieces.append(' ' + token)
+                    after_comment = bool(stack)
+                newline_seen = False
+            elif kind == 'string':
+                pieces.append(value_prefix(idx, True) + token)
+                after_comment = newline_seen = False
+                top = stack[-1] if stack else None
+                if top is not None and top[2] == KEY:
+                    # Like the decoder, take the character after a key as
+                    # the ':', whatever it is, unless it is whitespace
+                    if stop < size and buf[stop] not in WHITESPACE_STR:
+                        top[2] = VALUE
+                        stop += 1
+                    else:
+                        top[2] = COLON
+                else:
+                    value_done(pieces)
+            elif kind == 'atom':
+                pieces.append(value_prefix(idx, False) + token)
+                after_comment = newline_seen = False
+                value_done(pieces)
+            elif token == ':':
+                # Only allowed between a key and the whitespace after it
+                if not stack or stack[-1][2] != COLON:
+                    raise error("Unexpected ':'", idx)
+                stack[-1][2] = VALUE
+            elif token in '[{':
+                pieces.append(value_prefix(idx, False) + token)
+                after_comment = newline_seen = False
+                stack.append([']' if token == '[' else '}', 0,
+                              None if token == '[' else KEY])
+            else:
+                if not stack or stack[-1][0] != token:
+                    raise error(f"Unexpected '{token}'", idx)
+                top = stack.pop()
+                if top[2] is not None and top[2] != KEY:
+                    raise error('Expecting value', idx)
+                if after_comment or (pretty and top[1]):
+                    token = '\n' + indent * len(stack) + token
+                pieces.append(token)
+                after_comment = newline_seen = False
+                value_done(pieces)
+
+            idx = stop
+
+        if pieces:
+            write(''.join(pieces))
+
+        nl = buf.rfind('\n', 0, idx)
+        if nl >= 0:
+            lineno += buf.count('\n', 0, idx)
+            colno = idx - nl
+        else:
+            colno += idx
+        offset += idx
+        buf = buf[idx:]
+
+    if stack:
+        raise unclosed(len(buf))
+
+    if not ndocs and not edn_lines:
+        raise error('Expecting value', len(buf))
@@ -0,0 +1,323 @@
+"""Checks of KIM property instances against their property definition.
+
+A KIM property definition declares, for each key of its property instances,
+the ``type`` of the values (``"string"``, ``"float"``, ``"int"``, ``"bool"``
+or ``"file"``), their ``extent``, whether the key is ``required`` and
+whether the value ``has-unit``. The definition is compiled once into one
+check function per key.
+
+Besides vectors, the checks accept arrays such as the NumPy ones, which
+have a ``shape`` and a ``dtype``: their extent and type are checked at
+once, from the shape and the dtype kind, without looking at the items.
+"""
+from kim_edn.decoder import (KIMEDNDecoder, KIMEDNDecodeError,
+                             WHITESPACE, STRIP_COMMENT)
+
+__all__ = ['compile_validator', 'PropertySchema', 'SchemaDecoder']
+
+# The keys of a property instance which are not property keys
+_INSTANCE_KEYS = ('property-id', 'instance-id', 'disclaimer')
+
+
+def _is_str(value):
+    return isinstance(value, str)
+
+
+def _is_number(value):
+    return (isinstance(value, (int, float))
+            and value.__class__ is not bool)
+
+
+def _is_int(value):
+    return isinstance(value, int) and value.__class__ is not bool
+
+
+def _is_bool(value):
+    return value is True or value is False
+
+
+# The check of each type of scalar, and the array dtype kinds of each
+# type. Integers are valid floats.
+_SCALARS = {
+    'string': _is_str,
+    'file': _is_str,
+    'float': _is_number,
+    'int': _is_int,
+    'bool': _is_bool,
+}
+_KINDS = {
+    'string': 'U',
+    'file': 'U',
+    'float': 'fiu',
+    'int': 'iu',
+    'bool': 'b',
+}
+
+
+def _vector(item, extent, kinds):
+    """Return a check of the vectors of ``extent`` items.
+
+    ``item`` checks the items of a vector, and ``kinds`` are the valid
+    dtype kinds of an array.
+    """
+    n = extent[0]
+    ndim = len(extent)
+
+    def check_array(value, shape):
+        if len(shape) != ndim:
+            return False
+        for m, size in zip(extent, shape):
+            if m is not None and m != size:
+                return False
+
+        kind = value.dtype.kind
+        if kind == 'O':
+            # The items of an object array are checked one by one
+            return check(value.tolist())
+        return kind in kinds
+
+    def check(value):
+        if isinstance(value, list):
+            return ((n is None or len(value) == n)
+                    and all(map(item, value)))
+
+        shape = getattr(value, 'shape', None)
+        if shape is None or not hasattr(value, 'dtype'):
+            return False
+        return check_array(value, shape)
+
+    return check
+
+
+def _parse_extent(name, extent):
+    """Return ``extent`` as a tuple of sizes, ``None`` for ``':'``."""
+    if not isinstance(extent, list):
+        raise ValueError(f'Invalid extent of {name!r}: {extent!r}')
+
+    sizes = []
+    for n in extent:
+        if n == ':':
+            sizes.append(None)
+        elif _is_int(n) and n >= 0:
+            sizes.append(n)
+        else:
+            raise ValueError(f'Invalid extent of {name!r}: {extent!r}')
+    return tuple(sizes)
+
+
+def _compile_key(name, spec):
+    """Return the check of the values of the property key ``name``.
+
+    The check returns ``None`` for a valid value, or else the reason why it
+    is not.
+    """
+    try:
+        scalar = _SCALARS[spec['type']]
+    except (KeyError, TypeError):
+        raise ValueError(f'Invalid type of {name!r}: '
+                         f'{spec.get("type")!r}') from None
+
+    extent = _parse_extent(name, spec.get('extent', []))
+    check_value = scalar
+    for i in reversed(range(len(extent))):
+        check_value = _vector(check_value, extent[i:], _KINDS[spec['type']])
+
+    has_unit = spec.get('has-unit', False) is True
+    expected = (f'of type {spec["type"]} and extent '
+                f'{list(extent)!r}'.replace('None', "':'"))
+
+    def invalid(value):
+        """Return why ``value`` is not valid."""
+        if not isinstance(value, dict):
+            return 'expecting a map'
+        if 'source-value' not in value:
+            return 'missing "source-value"'
+        if not check_value(value['source-value']):
+            return f'"source-value" is not {expected}'
+        if 'source-unit' not in value:
+            return 'missing "source-unit"'
+        return '"source-unit" is not a string'
+
+    # The valid values only go through the checks
+    if has_unit:
+        def check(value):
+            try:
+                if (check_value(value['source-value'])
+                        and isinstance(value['source-unit'], str)):
+                    return None
+            except (KeyError, TypeError):
+                pass
+            return invalid(value)
+    else:
+        def check(value):
+            try:
+                if check_value(value['source-value']):
+                    return None
+            except (KeyError, TypeError):
+                pass
+            return invalid(value)
+
+    return check
+
+
+class PropertySchema(object):
+    """Compiled KIM property definition.
+
+    ``checks`` maps each key of the property instances to the function
+    checking its values, which returns ``None`` for a valid value or else
+    the reason why it is not. ``required`` is the set of the required keys.
+
+    """
+
+    def __init__(self, definition):
+        """KIM-EDN PropertySchema constructor."""
+        if not isinstance(definition, dict) \
+                or not isinstance(definition.get('property-id'), str):
+            raise ValueError('Invalid property definition, '
+                             'expecting a map with a "property-id"')
+
+        self.property_id = property_id = definition['property-id']
+
+        def check_property_id(value):
+            if value != property_id:
+                return f'expecting {property_id!r}'
+            return None
+
+        def check_instance_id(value):
+            if not _is_int(value):
+                return 'expecting an integer'
+            return None
+
+        def check_disclaimer(value):
+            if not isinstance(value, str):
+                return 'expecting a string'
+            return None
+
+        self.checks = {
+            'property-id': check_property_id,
+            'instance-id': check_instance_id,
+            'disclaimer': check_disclaimer,
+        }
+        required = {'property-id', 'instance-id'}
+
+        for name, spec in definition.items():
+            # The other keys are the title and description of the property
+            if name in _INSTANCE_KEYS or not isinstance(spec, dict):
+                continue
+
+            self.checks[name] = _compile_key(name, spec)
+            if spec.get('required', False) is True:
+                required.add(name)
+
+        self.required = frozenset(required)
+
+    def check_pair(self, key, value):
+        """Return why ``value`` is not valid for ``key``, or ``None``."""
+        check = self.checks.get(key)
+        if check is None:
+            return 'unknown key'
+        return check(value)
+
+    def missing(self, keys):
+        """Return the sorted required keys which are not in ``keys``."""
+        return sorted(self.required.difference(keys))
+
+
+def compile_validator(definition):
+    r"""Return a function checking property instances against ``definition``.
+
+    ``definition`` is a KIM property definition, or a ``PropertySchema``.
+    The returned function takes a decoded property instance, a ``dict``, and
+    raises a ``ValueError`` naming the first invalid key if the instance
+    does not match the definition: an unknown key, a value of the wrong type
+    or extent, a missing or non-string ``"source-unit"`` or a missing
+    required key. The values may be vectors or arrays with a ``shape`` and a
+    ``dtype``, such as the NumPy ones.
+
+    The definition is compiled once, so checking many instances only runs
+    the compiled checks of their keys.
+
+    """
+    schema = definition
+    if not isinstance(schema, PropertySchema):
+        schema = PropertySchema(definition)
+
+    checks_get = schema.checks.get
+    required = schema.required
+    missing = schema.missing
+
+    def validate(instance):
+        if not isinstance(instance, dict):
+            raise ValueError('Invalid property instance, expecting a map')
+
+        for key, value in instance.items():
+            check = checks_get(key)
+            if check is None:
+                raise ValueError(f'Invalid {key!r}: unknown key')
+            msg = check(value)
+            if msg is not None:
+                raise ValueError(f'Invalid {key!r}: {msg}')
+
+        if not required <= instance.keys():
+            raise ValueError('Missing required keys '
+                             f'{", ".join(map(repr, missing(instance)))}')
+
+    return validate
+
+
+class SchemaDecoder(KIMEDNDecoder):
+    """A KIM-EDN decoder of property instances of a property definition.
+
+    Each key of the property instance is checked as soon as its value is
+    decoded, so an invalid instance fails on its first invalid key, before
+    the rest of the document is decoded. An invalid instance raises a
+    ``KIMEDNDecodeError`` at the position of the invalid value.
+
+    """
+
+    def __init__(self, schema, *, strict=True):
+        """KIM-EDN SchemaDecoder constructor.
+
+        ``schema`` is a property definition, or a ``PropertySchema``.
+        ``strict`` has the same meaning as in ``KIMEDNDecoder``.
+
+        """
+        super().__init__(strict=strict)
+        if not isinstance(schema, PropertySchema):
+            schema = PropertySchema(schema)
+        self.schema = schema
+
+    def raw_decode(self, s, idx=0, _w=WHITESPACE.match,
+                   _sc=STRIP_COMMENT.search):
+        """Decode a property instance from ``s``.
+
+        The same as ``KIMEDNDecoder.raw_decode``, for the property instance
+        maps of the schema.
+
+        """
+        idx = _w(s, idx).end()
+        while s[idx:idx + 1] == ';':
+            idx += _sc(s[idx:]).end()
+            idx = _w(s, idx).end()
+
+        if s[idx:idx + 1] != '{':
+            raise KIMEDNDecodeError('Expecting property instance', s, idx)
+
+        check_pair = self.schema.check_pair
+
+        def check(key, value, pos):
+            msg = check_pair(key, value)
+            if msg is not None:
+                raise KIMEDNDecodeError(f'Invalid {key!r}: {msg}', s, pos)
+
+        obj, end = self.parse_object((s, idx + 1), self.strict,
+                                     self.scan_once, self.object_hook,
+                                     self.object_pairs_hook, {}, check)
+
+        missing = self.schema.missing(obj)
+        if missing:
+            raise KIMEDNDecodeError(
+                f'Missing required keys {", ".join(map(repr, missing))}',
+                s, end - 1)
+
+        return obj, end
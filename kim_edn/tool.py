@@ -23,6 +23,18 @@ Command-line tool to validate and pretty-print KIM-EDN
         ]
     }
 
+    Rewrite the layout without decoding, keeping comments and numbers::
+    $ python -m kim_edn.tool --reindent --indent 2 property.edn
+    $ python -m kim_edn.tool --minify --strip-comments property.edn
+
+    Convert between KIM-EDN and JSON, or KIM-EDN lines and JSON lines::
+    $ python -m kim_edn.tool --to-json property.edn property.json
+    $ python -m kim_edn.tool --from-json --edn-lines instances.jsonl instances.edn
+
+    Validate, or pretty-print in place, many files::
+    $ python -m kim_edn.tool --check --jobs 0 properties/ 'tests/**/*.edn'
+    $ python -m kim_edn.tool --in-place --jobs 0 properties/
+
     # NOTE
     Wrong use case::
     $ echo '{1.2 3.4}' | python -m kim_edn.tool
@@ -31,8 +43,26 @@ Command-line tool to validate and pretty-print KIM-EDN
 
 """
 import argparse
+import collections
+import contextlib
+import functools
+import glob
+import io
+import itertools
+import json
 import kim_edn
+from kim_edn import _util
+from kim_edn.reformat import reformat
+import os
+import stat
 import sys
+import tempfile
+
+# Number of KIM-EDN lines handed to a worker process at a time
+BATCH_SIZE = 1000
+
+# The text written after each output document
+END = '\n\n'
 
 
 def main():
@@ -44,13 +74,12 @@ def main():
 
     parser = argparse.ArgumentParser(prog=prog, description=description)
 
-    parser.add_argument('infile', nargs='?',
-                        help='a KIM-EDN file to be validated or pretty-printed',
-                        default='-')
-
-    parser.add_argument('outfile', nargs='?',
-                        help='write the output of infile to outfile',
-                        default=None)
+    parser.add_argument('files', nargs='*', metavar='file',
+                        help='a KIM-EDN file to be validated or pretty-printed, '
+                        'optionally followed by the file to write the output '
+                        'to (default: stdin and stdout); with --check or '
+                        '--in-place, any number of files, directories (searched '
+                        'for *.edn files) and glob patterns')
 
     parser.add_argument('--sort-keys', action='store_true', default=False,
                         help='sort the output of dictionaries alphabetically by key')
@@ -58,18 +87,56 @@ def main():
     parser.add_argument('--edn-lines', action='store_true', default=False,
                         help='parse input using the kim_edn lines format')
 
+    parser.add_argument('--jobs', default=None, type=int,
+                        help='process the --edn-lines input, or the files of '
+                        '--check and --in-place, in this number of worker '
+                        'processes (0 for one per CPU)')
+
+    batch = parser.add_mutually_exclusive_group()
+
+    batch.add_argument('--check', action='store_true',
+                       help='validate the files and report the status of each')
+
+    batch.add_argument('--in-place', action='store_true',
+                       help='pretty-print the files in place, leaving the '
+                       'files whose content would not change untouched')
+
+    mode = parser.add_mutually_exclusive_group()
+
+    mode.add_argument('--reindent', action='store_true',
+                      help='rewrite the layout from the token stream, '
+                      'without decoding, keeping the comments and the text '
+                      'of the numbers and strings')
+
+    mode.add_argument('--minify', action='store_true',
+                      help='like --reindent, but suppress all whitespace '
+                      'separation')
+
+    mode.add_argument('--to-json', action='store_true',
+                      help='convert KIM-EDN to JSON, or KIM-EDN lines to JSON '
+                      'lines with --edn-lines (default: compact output)')
+
+    mode.add_argument('--from-json', action='store_true',
+                      help='convert JSON to KIM-EDN, or JSON lines to KIM-EDN '
+                      'lines with --edn-lines (default: compact output)')
+
+    parser.add_argument('--strip-comments', action='store_true',
+                        help='drop the comments (with --reindent or --minify)')
+
     group = parser.add_mutually_exclusive_group()
 
-    group.add_argument('--indent', default=4, type=int,
+    # The default indent depends on --to-json and --from-json
+    group.add_argument('--indent', default=argparse.SUPPRESS, type=int,
                        help='separate items with newlines and use this number '
-                       'of spaces for indentation')
+                       'of spaces for indentation (default: 4)')
 
     group.add_argument('--tab', action='store_const', dest='indent',
-                       const='\t', help='separate items with newlines and use '
-                       'tabs for indentation')
+                       const='\t', default=argparse.SUPPRESS,
+                       help='separate items with newlines and use tabs for '
+                       'indentation')
 
     group.add_argument('--no-indent', action='store_const', dest='indent',
-                       const=None,
+                       const=None, default=argparse.SUPPRESS,
                        help='separate items with spaces rather than newlines')
 
     group.add_argument('--compact', action='store_true',
@@ -77,9 +144,59 @@ def main():
 
     options = parser.parse_args()
 
-    if options.compact:
+    options.convert = options.to_json or options.from_json
+    if options.convert:
+        if options.check or options.in_place:
+            parser.error('--to-json and --from-json cannot be used with '
+                         '--check or --in-place')
+
+        if options.jobs is not None:
+            parser.error('--jobs cannot be used with --to-json or --from-json')
+
+        if options.edn_lines and hasattr(options, 'indent'):
+            parser.error('--indent, --tab and --no-indent cannot be used '
+                         'with --edn-lines and --to-json or --from-json')
+
+    if not hasattr(options, 'indent'):
+        options.indent = None if options.convert else 4
+
+    if options.compact or options.minify:
         options.indent = None
 
+    options.tokens = options.reindent or options.minify
+    if options.tokens and options.sort_keys:
+        parser.error('--sort-keys cannot be used with --reindent or --minify')
+
+    if options.strip_comments and not options.tokens:
+        parser.error('--strip-comments needs --reindent or --minify')
+
+    if options.jobs is None:
+        options.jobs = 1
+    elif not (options.edn_lines or options.check or options.in_place):
+        parser.error('--jobs needs --edn-lines, --check or --in-place')
+    elif options.jobs < 0:
+        parser.error('--jobs must be a non-negative integer')
+    elif options.jobs == 0:
+        options.jobs = os.cpu_count() or 1
+
+    if options.check or options.in_place:
+        if not options.files:
+            parser.error('--check and --in-place need at least one file')
+
+        if '-' in options.files:
+            parser.error('--check and --in-place cannot read from stdin')
+
+        raise SystemExit(_process_files(options))
+
+    if len(options.files) > 2:
+        parser.error('more than one input file needs --check or --in-place')
+
+    options.infile = options.files[0] if options.files else '-'
+    options.outfile = options.files[1] if len(options.files) > 1 else None
+
+    if options.convert:
+        return _convert(options)
+
     try:
         if options.infile == '-':
             infile = sys.stdin
@@ -87,30 +204,305 @@ def main():
             infile = open(options.infile, encoding='utf-8')
 
         try:
-            if options.edn_lines:
-                objs = (kim_edn.loads(line) for line in infile)
+            if options.tokens:
+                text = infile
+                # Read all the text before rewriting the input file
+                if _samefile(options.infile, options.outfile):
+                    text = io.StringIO(infile.read())
+                objs = None
+            elif options.edn_lines and options.jobs > 1:
+                lines = infile
+                # Read all the lines before rewriting the input file
+                if _samefile(options.infile, options.outfile):
+                    lines = infile.readlines()
+                objs = None
+            elif options.edn_lines:
+                objs = kim_edn.load_lines(infile)
+                # Read all the lines before rewriting the input file
+                if _samefile(options.infile, options.outfile):
+                    objs = list(objs)
             else:
                 objs = (kim_edn.load(infile), )
+
+            if options.outfile is None:
+                outfile = sys.stdout
+            else:
+                outfile = open(options.outfile, 'w', encoding='utf-8')
+
+            with outfile:
+                if options.tokens:
+                    reformat(text, outfile, indent=options.indent,
+                             strip_comments=options.strip_comments,
+                             edn_lines=options.edn_lines, end=END)
+                elif objs is None:
+                    _reformat_lines_parallel(lines, outfile, options)
+                else:
+                    for obj in objs:
+                        outfile.write(_encode(obj, options.sort_keys,
+                                              options.indent))
+
+            if outfile is not sys.stdout:
+                outfile.close()
         finally:
             if infile is not sys.stdin:
                 infile.close()
+    except ValueError as e:
+        raise SystemExit(e)
+
 
-        if options.outfile is None:
-            outfile = sys.stdout
+def _convert(options):
+    """Convert between KIM-EDN and JSON, for ``--to-json``/``--from-json``."""
+    to_json = options.to_json
+    try:
+        if options.infile == '-':
+            infile = sys.stdin
         else:
-            outfile = open(options.outfile, 'w', encoding='utf-8')
+            infile = open(options.infile, encoding='utf-8')
 
-        with outfile:
-            for obj in objs:
-                kim_edn.dump(obj, outfile, sort_keys=options.sort_keys, indent=options.indent)
-                outfile.write('\n')
+        try:
+            if options.edn_lines:
+                lines = infile
+                # Read all the lines before rewriting the input file
+                if _samefile(options.infile, options.outfile):
+                    lines = infile.readlines()
+            else:
+                text = infile.read()
 
-        if outfile is not sys.stdout:
-            outfile.close()
-    except ValueError as e:
+            if options.outfile is None:
+                outfile = sys.stdout
+            else:
+                outfile = open(options.outfile, 'w', encoding='utf-8')
+
+            with outfile:
+                if to_json and options.edn_lines:
+                    decode = functools.partial(kim_edn.loads, engine='json')
+                    dumps = json.JSONEncoder(sort_keys=options.sort_keys).encode
+                    outfile.writelines(
+                        dumps(obj) + '\n'
+                        for obj in _util.decode_lines(lines, decode, True))
+                elif to_json:
+                    obj = kim_edn.loads(text, engine='json')
+                    # json.dump never uses the C encoder, json.dumps does
+                    outfile.write(json.dumps(obj, sort_keys=options.sort_keys,
+                                             indent=options.indent) + '\n')
+                elif options.edn_lines:
+                    kim_edn.dump_lines(_json_lines(lines), outfile,
+                                       sort_keys=options.sort_keys)
+                else:
+                    kim_edn.dump(json.loads(text), outfile,
+                                 sort_keys=options.sort_keys,
+                                 indent=options.indent)
+
+            if outfile is not sys.stdout:
+                outfile.close()
+        finally:
+            if infile is not sys.stdin:
+                infile.close()
+    except (ValueError, TypeError) as e:
         raise SystemExit(e)
 
 
+def _json_lines(lines):
+    """Yield the decoded JSON documents of ``lines``, skipping blank lines."""
+    decode = json.JSONDecoder().decode
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        try:
+            yield decode(line)
+        except json.JSONDecodeError as err:
+            raise ValueError(f'{err} (JSON lines, line {lineno})') from None
+
+
+def _reformat_lines_parallel(lines, outfile, options):
+    """Decode and re-encode KIM-EDN lines in a pool of worker processes.
+
+    The lines are sent to the workers in batches of ``BATCH_SIZE``, and the
+    output of the batches is written in the input order. At most two batches
+    per worker are in flight, so the memory use does not grow with the input.
+    """
+    # Imported here, as it takes longer to import than the rest of the tool
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(options.jobs) as executor:
+        pending = collections.deque()
+        try:
+            for lineno, batch in _batches(lines, BATCH_SIZE):
+                pending.append(executor.submit(_reformat_lines, lineno, batch,
+                                               options.sort_keys,
+                                               options.indent))
+                if len(pending) > 2 * options.jobs:
+                    outfile.write(pending.popleft().result())
+
+            while pending:
+                outfile.write(pending.popleft().result())
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+
+def _batches(lines, size):
+    """Yield the line number of the first line and the list of each batch."""
+    lines = iter(lines)
+    lineno = 1
+    batch = list(itertools.islice(lines, size))
+    while batch:
+        yield lineno, batch
+        lineno += len(batch)
+        batch = list(itertools.islice(lines, size))
+
+
+def _reformat_lines(lineno, lines, sort_keys, indent):
+    """Return the re-encoded KIM-EDN ``lines``, run in a worker process.
+
+    ``lineno`` is the line number of the first line, for the error messages.
+    """
+    chunks = []
+    for lineno, line in enumerate(lines, lineno):
+        stripped = line.lstrip(', \t\n\r')
+        if not stripped or stripped[0] == ';':
+            continue
+
+        try:
+            obj = kim_edn.loads(line)
+        except kim_edn.KIMEDNDecodeError as err:
+            msg = f'{err.msg} (KIM-EDN lines, line {lineno})'
+            raise kim_edn.KIMEDNDecodeError(msg, err.doc, err.pos) from None
+
+        chunks.append(_encode(obj, sort_keys, indent))
+
+    return ''.join(chunks)
+
+
+def _encode(obj, sort_keys, indent):
+    """Return the output text of the decoded document ``obj``."""
+    return kim_edn.dumps(obj, sort_keys=sort_keys, indent=indent) + END
+
+
+def _process_files(options):
+    """Validate or rewrite in place many files, and return the exit status.
+
+    A line with the status of each file is written to stdout, or to stderr
+    for the files which failed.
+    """
+    paths = _expand_paths(options.files)
+    args = (options.edn_lines, options.sort_keys, options.indent,
+            options.in_place, options.tokens, options.strip_comments)
+
+    status = 0
+    with contextlib.ExitStack() as stack:
+        if options.jobs > 1 and len(paths) > 1:
+            import concurrent.futures
+            executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(options.jobs))
+            results = executor.map(_process_file, paths,
+                                   *(itertools.repeat(arg) for arg in args))
+        else:
+            results = (_process_file(path, *args) for path in paths)
+
+        for path, ok, message in results:
+            if ok:
+                print(f'{path}: {message}')
+            else:
+                print(f'{path}: {message}', file=sys.stderr)
+                status = 1
+
+    return status
+
+
+def _expand_paths(patterns):
+    """Return the files named by ``patterns`` without duplicates.
+
+    Directories are searched recursively for ``*.edn`` files, and glob
+    patterns are expanded (``**`` matches any number of directories). A
+    pattern which matches nothing is kept, to be reported as missing.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith('.edn'))
+        elif _has_magic(pattern):
+            paths.extend(sorted(path for path in glob.iglob(pattern, recursive=True)
+                                if os.path.isfile(path)) or [pattern])
+        else:
+            paths.append(pattern)
+
+    return list(dict.fromkeys(paths))
+
+
+def _has_magic(pattern):
+    """Return whether ``pattern`` has glob wildcards."""
+    return any(c in pattern for c in '*?[')
+
+
+def _process_file(path, edn_lines, sort_keys, indent, in_place, tokens,
+                  strip_comments):
+    """Validate or rewrite in place one file, run in a worker process.
+
+    Return the ``path``, whether it succeeded, and its status message.
+    """
+    try:
+        with open(path, encoding='utf-8') as fp:
+            data = fp.read()
+
+        if tokens:
+            out = io.StringIO()
+            reformat(io.StringIO(data), out, indent=indent,
+                     strip_comments=strip_comments, edn_lines=edn_lines,
+                     end=END)
+            text = out.getvalue()
+        elif edn_lines:
+            # Split on '\n' only, as when reading a stream of lines
+            text = _reformat_lines(1, io.StringIO(data), sort_keys, indent)
+        else:
+            text = _encode(kim_edn.loads(data), sort_keys, indent)
+
+        if not in_place:
+            return path, True, 'ok'
+
+        if text == data:
+            return path, True, 'unchanged'
+
+        _replace(path, text)
+    except (OSError, ValueError) as e:
+        return path, False, str(e)
+
+    return path, True, 'reformatted'
+
+
+def _replace(path, text):
+    """Replace the content of the file ``path`` with ``text`` atomically.
+
+    The text is written to a temporary file next to ``path``, which then
+    takes its place, so an interrupted write leaves ``path`` untouched.
+    """
+    fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path) or '.')
+    try:
+        with open(fd, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _samefile(infile, outfile):
+    """Return whether the infile and outfile arguments name the same file."""
+    if infile == '-' or outfile is None or not os.path.exists(outfile):
+        return False
+
+    return os.path.samefile(infile, outfile)
+
+
 if __name__ == '__main__':
     try:
         main()
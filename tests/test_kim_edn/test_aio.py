@@ -0,0 +1,176 @@
+import asyncio
+from collections import namedtuple, OrderedDict
+import concurrent.futures
+import io
+from tests.test_kim_edn import PyTest
+from tests.test_kim_edn.test_comment import COMMENTEDDOC, DOC
+from tests.test_kim_edn.test_pass1 import DOCS as PASS1
+
+
+class Writer:
+    def __init__(self):
+        self.data = bytearray()
+        self.drains = 0
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        self.drains += 1
+
+
+class AwaitableWriter(Writer):
+    async def write(self, data):
+        self.data += data
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+class TestAio:
+    def run_with_reader(self, func, data, chunk_size=None, **kw):
+        async def main():
+            reader = asyncio.StreamReader()
+            step = chunk_size or len(data) or 1
+            for i in range(0, len(data), step):
+                reader.feed_data(data[i:i + step])
+            reader.feed_eof()
+            return await func(reader, **kw)
+
+        return asyncio.run(main())
+
+    def test_aload_documents(self):
+        for doc in (PASS1, DOC, COMMENTEDDOC, '[1 2.5 "a" true]', '{}'):
+            expected = self.loads(doc)
+            for chunk_size in (1, 3, None):
+                self.assertEqual(self.run_with_reader(
+                    self.kim_edn.aload, doc.encode('utf-8'), chunk_size,
+                    read_size=3), expected)
+
+    def test_aload_loads_parity(self):
+        # Malformed text is rejected exactly as loads rejects it
+        for doc in ('{"a"1}', '{"a"[1]}', '{"a" 1 "b"2}', '0;x\n', '[1-2]', '[01]',
+                    '[true-23.5]', '{"a"x1}', '{"a"}1}', '; c\n[1]', '[1] ; c',
+                    '[1 2', '[1] [2]', '{"a" 1 "b" x}', '{1 2}', '["a" "b\\x"]',
+                    '"abc', ''):
+            try:
+                expected = self.loads(doc)
+            except self.KIMEDNDecodeError as err:
+                expected = (err.msg, err.pos)
+            for chunk_size in (1, None):
+                with self.subTest(doc=doc, chunk_size=chunk_size):
+                    try:
+                        result = self.run_with_reader(
+                            self.kim_edn.aload, doc.encode('utf-8'), chunk_size)
+                    except self.KIMEDNDecodeError as err:
+                        result = (err.msg, err.pos)
+                    self.assertEqual(result, expected)
+
+    def test_aload(self):
+        doc = '{"a" [1 2.5 "é€"] ; comment\n "b" {"c" true}}'
+        expected = self.loads(doc)
+        data = doc.encode('utf-8')
+        for chunk_size in (1, 5, None):
+            self.assertEqual(self.run_with_reader(
+                self.kim_edn.aload, data, chunk_size, read_size=4), expected)
+
+        self.assertEqual(self.run_with_reader(
+            self.kim_edn.aload, data, object_pairs_hook=OrderedDict),
+            OrderedDict(expected))
+        self.assertEqual(self.run_with_reader(
+            self.kim_edn.aload, b'[1.5 2]', parse_float=str), ['1.5', 2])
+
+        with self.assertRaises(self.KIMEDNDecodeError):
+            self.run_with_reader(self.kim_edn.aload, b'[1 2] [3]')
+
+    def test_aiter_lines(self):
+        async def collect(reader, **kw):
+            return [obj async for obj in self.kim_edn.aiter_lines(reader, **kw)]
+
+        data = b'{"a" 1}\n\n; comment\n[1 2]\r\n"\xc3\xa9"'
+        for chunk_size in (1, 4, None):
+            self.assertEqual(self.run_with_reader(
+                collect, data, chunk_size, read_size=3),
+                [{"a": 1}, [1, 2], "é"])
+
+        with self.assertRaisesRegex(self.KIMEDNDecodeError,
+                                    r'KIM-EDN lines, line 3'):
+            self.run_with_reader(collect, b'[1]\n[2]\n[3\n[4]\n', 2)
+
+        # A newline at the end of the stream ends the last line
+        for data in (b'1\n2\n', b'1\n2'):
+            for chunk_size in (1, None):
+                self.assertEqual(self.run_with_reader(
+                    collect, data, chunk_size, skip_empty=False), [1, 2])
+        self.assertEqual(list(self.kim_edn.load_lines(io.StringIO('1\n2\n'),
+                                                      skip_empty=False)), [1, 2])
+
+        # and with edn_lines, as load_lines rejects it
+        for data in ('[1]\n{"a"1}\n', '[1] [2]\n', '[1\n2]\n', '[01]\n; c\n{"a"x1}'):
+            try:
+                expected = list(self.kim_edn.load_lines(io.StringIO(data)))
+            except self.KIMEDNDecodeError as err:
+                expected = err.msg
+            with self.subTest(data=data):
+                try:
+                    result = self.run_with_reader(collect, data.encode(), 1)
+                except self.KIMEDNDecodeError as err:
+                    result = err.msg
+                self.assertEqual(result, expected)
+
+        Value = namedtuple('Value', ['source_value'])
+        self.assertEqual(self.run_with_reader(
+            collect, b'{"source-value" 1}\n',
+            record_types={frozenset(['source-value']): Value}), [Value(1)])
+
+    def test_adump(self):
+        obj = {"a": [1, 2.5, "é"] * 1000, "b": True}
+        for writer in (Writer(), AwaitableWriter()):
+            asyncio.run(self.kim_edn.adump(obj, writer, buffer_size=100))
+            self.assertEqual(writer.data.decode('utf-8'),
+                             self.dumps(obj) + '\n')
+
+        writer = Writer()
+        asyncio.run(self.kim_edn.adump(obj, writer, indent=2, buffer_size=100))
+        self.assertEqual(writer.data.decode('utf-8'),
+                         self.dumps(obj, indent=2) + '\n')
+        self.assertGreater(writer.drains, 10)
+
+    def test_aloads(self):
+        doc = '{"a" [1 2.5] "b" "c"}'
+        expected = self.loads(doc)
+        with CountingExecutor() as executor:
+            self.assertEqual(asyncio.run(self.kim_edn.aloads(
+                doc, executor=executor)), expected)
+            self.assertEqual(executor.submitted, 0)
+
+            self.assertEqual(asyncio.run(self.kim_edn.aloads(
+                doc.encode(), executor=executor, threshold=0,
+                object_pairs_hook=OrderedDict)), OrderedDict(expected))
+            self.assertEqual(executor.submitted, 1)
+
+            with self.assertRaises(self.KIMEDNDecodeError):
+                asyncio.run(self.kim_edn.aloads('[1 2', executor=executor,
+                                                threshold=0))
+
+        for executor in ('thread', 'process', None):
+            self.assertEqual(asyncio.run(self.kim_edn.aloads(
+                doc, executor=executor, threshold=0, engine='json')),
+                expected)
+
+        with self.assertRaisesRegex(self.KIMEDNDecodeError, 'Extra data'):
+            asyncio.run(self.kim_edn.aloads('[1] 2', executor='process',
+                                            threshold=0))
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.kim_edn.aloads(doc, executor='fiber',
+                                            threshold=0))
+
+
+class TestPyAio(TestAio, PyTest):
+    pass
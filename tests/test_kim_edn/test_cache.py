@@ -0,0 +1,203 @@
+from collections import OrderedDict
+import os
+import tempfile
+from tests.test_kim_edn import PyTest
+
+
+class TestCache:
+    def _create_file(self, data, name='doc.edn'):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write(data)
+        return path
+
+    def test_hits_and_copies(self):
+        path = self._create_file('{"a" [1 2.5] "b" {"c" true}}')
+        cache = self.kim_edn.DocumentCache()
+
+        first = self.kim_edn.load(path, cache=cache)
+        second = self.kim_edn.load(path, cache=cache)
+        self.assertEqual(first, {"a": [1, 2.5], "b": {"c": True}})
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+
+        second["a"].append(3)
+        self.assertEqual(cache.load(path), first)
+        self.assertEqual(cache.hits, 2)
+
+    def test_modified_file(self):
+        path = self._create_file('[1]')
+        cache = self.kim_edn.DocumentCache()
+        self.assertEqual(cache.load(path), [1])
+
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write('[1 2]')
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+        self.assertEqual(cache.load(path), [1, 2])
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 2, 1))
+
+    def test_options_in_key(self):
+        path = self._create_file('{"a" 1.5}')
+        cache = self.kim_edn.DocumentCache()
+
+        self.assertEqual(cache.load(path), {"a": 1.5})
+        pairs = cache.load(path, object_pairs_hook=OrderedDict)
+        self.assertIsInstance(pairs, OrderedDict)
+        self.assertIsNot(cache.load(path, object_pairs_hook=OrderedDict), pairs)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+
+    def test_eviction(self):
+        paths = [self._create_file(f'[{i}]') for i in range(3)]
+        cache = self.kim_edn.DocumentCache(maxsize=2)
+        for path in paths + paths[2:]:
+            cache.load(path)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 3, 2))
+
+        cache.load(paths[0])
+        self.assertEqual(cache.misses, 4)
+
+        cache = self.kim_edn.DocumentCache(maxbytes=0)
+        cache.load(paths[0])
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    def test_not_a_file(self):
+        cache = self.kim_edn.DocumentCache()
+        self.assertEqual(self.kim_edn.load('["not" "a" "file"]', cache=cache), ["not", "a", "file"])
+        self.assertEqual(self.kim_edn.load('[1]', cache=True), [1])
+        self.assertEqual(len(cache), 0)
+
+
+class TestPyCache(TestCache, PyTest):
+    pass
+
+
+class TestDiskCache:
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+        self.cachedir = os.path.join(tmpdir.name, 'cache')
+
+    def _create_file(self, data, name='doc.edn'):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write(data)
+        return path
+
+    def _entries(self):
+        return sorted(name for name in os.listdir(self.cachedir)
+                      if name != self.kim_edn.DiskCache.STAMP)
+
+    def test_hits(self):
+        path = self._create_file('{"a" [1 2.5] "b" {"c" true}}')
+        self.assertEqual(self.kim_edn.load(path, disk_cache=self.cachedir),
+                         {"a": [1, 2.5], "b": {"c": True}})
+        self.assertEqual(len(self._entries()), 1)
+
+        # Another file with the same content shares the entry
+        other = self._create_file('{"a" [1 2.5] "b" {"c" true}}', 'other.edn')
+        cache = self.kim_edn.DiskCache(self.cachedir)
+        self.assertEqual(cache.load(other), {"a": [1, 2.5], "b": {"c": True}})
+        self.assertEqual(self.kim_edn.load(path, disk_cache=cache),
+                         {"a": [1, 2.5], "b": {"c": True}})
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+    def test_modified_and_corrupt(self):
+        path = self._create_file('[1]')
+        cache = self.kim_edn.DiskCache(self.cachedir)
+        self.assertEqual(cache.load(path), [1])
+
+        self._create_file('[1 2]')
+        self.assertEqual(cache.load(path), [1, 2])
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertEqual(len(self._entries()), 2)
+
+        for name in self._entries():
+            with open(os.path.join(self.cachedir, name), 'wb') as fp:
+                fp.write(b'\xff')
+        self.assertEqual(cache.load(path), [1, 2])
+        self.assertEqual(cache.load(path), [1, 2])
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_prune(self):
+        paths = [self._create_file(f'[{i}]', f'{i}.edn') for i in range(3)]
+        cache = self.kim_edn.DiskCache(self.cachedir)
+        cache.load(paths[0])
+        first = os.path.join(self.cachedir, self._entries()[0])
+        for path in paths[1:]:
+            cache.load(path)
+
+        # Entries of other versions and unused entries are stale
+        other = os.path.join(self.cachedir, '0' * 64 + '-old' + cache.SUFFIX)
+        with open(other, 'wb') as fp:
+            fp.write(b'0')
+        os.utime(first, (0, 0))
+        size = os.path.getsize(first)
+        self.assertEqual(cache.prune(), size + 1)
+        self.assertEqual(len(self._entries()), 2)
+        self.assertNotIn(os.path.basename(first), self._entries())
+
+        cache.max_bytes = 0
+        cache.prune()
+        self.assertEqual(self._entries(), [])
+
+    def test_prune_while_storing(self):
+        cache = self.kim_edn.DiskCache(self.cachedir, max_bytes=1600)
+        for i in range(100):
+            cache.load(self._create_file(f'[{i} "{"x" * 20}"]', f'{i}.edn'))
+
+        sizes = [os.path.getsize(os.path.join(self.cachedir, name))
+                 for name in self._entries()]
+        self.assertLess(len(sizes), 100)
+        self.assertLessEqual(sum(sizes), cache.max_bytes + cache.max_bytes // 16 + max(sizes))
+
+        # Stored bytes are counted from the last prune, and the stamp of
+        # the last prune is shared by all the processes
+        cache = self.kim_edn.DiskCache(self.cachedir, max_bytes=1600)
+        stamp = os.path.join(self.cachedir, cache.STAMP)
+        os.utime(stamp, (0, 0))
+        cache.load(self._create_file('[-1]', 'new.edn'))
+        self.assertGreater(os.path.getmtime(stamp), 0)
+        self.assertEqual(cache._stored, 0)
+
+    def test_text_mode(self):
+        # Newlines are translated as when kim_edn.load reads the file
+        path = os.path.join(self.tmpdir, 'crlf.edn')
+        with open(path, 'wb') as fp:
+            fp.write(b'["x\r\ny"\r\n 1]\r\n')
+
+        expect = self.kim_edn.load(path)
+        self.assertEqual(expect, ['x\ny', 1])
+        cache = self.kim_edn.DiskCache(self.cachedir)
+        self.assertEqual(cache.load(path), expect)
+        self.assertEqual(cache.load(path), expect)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_errors(self):
+        path = self._create_file('[1.5]')
+        with self.assertRaises(ValueError):
+            self.kim_edn.load(path, disk_cache=self.cachedir,
+                              parse_float=str)
+        self.assertEqual(self.kim_edn.load('[1]', disk_cache=self.cachedir),
+                         [1])
+        self.assertFalse(os.path.exists(self.cachedir))
+
+        memory = self.kim_edn.DocumentCache()
+        for _ in range(2):
+            self.assertEqual(self.kim_edn.load(path, cache=memory,
+                                               disk_cache=self.cachedir),
+                             [1.5])
+        self.assertEqual((memory.hits, memory.misses), (1, 1))
+        self.assertEqual(len(self._entries()), 1)
+
+
+class TestPyDiskCache(TestDiskCache, PyTest):
+    pass
@@ -0,0 +1,93 @@
+import glob
+from tests.test_kim_edn import PyTest
+from tests.test_kim_edn.test_comment import COMMENTEDDOC
+from tests.test_kim_edn.test_pass1 import DOCS as PASS1
+from tests.test_kim_edn.test_pass2 import DOCS as PASS2
+from tests.test_kim_edn.test_pass3 import DOCS as PASS3
+
+
+class TestCompact:
+    def assertRoundTrip(self, obj):
+        b = self.kim_edn.dumpb_compact(obj)
+        self.assertTrue(b.startswith(b'KEDC\x01'))
+        result = self.kim_edn.loadb_compact(b)
+        self.assertEqual(result, obj)
+        self.assertEqual(self.dumps(result), self.dumps(obj))
+        return b
+
+    def test_documents(self):
+        docs = [PASS1, PASS2, PASS3, COMMENTEDDOC]
+        for path in glob.glob('tests/fixtures/**/*.edn', recursive=True):
+            with open(path, encoding='utf-8') as fp:
+                docs.append(fp.read())
+
+        for doc in docs:
+            with self.subTest(doc=doc[:40]):
+                self.assertRoundTrip(self.loads(doc))
+
+    def test_values(self):
+        for obj in (True, False, 0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 63,
+                    -2 ** 63 - 1, 10 ** 40, -10 ** 40, 0.0, -0.0, 1e-320,
+                    1.7976931348623157e308, '', 'a€\U0001d11e\ud800',
+                    [], {}, [[1.5, 2.5], [1, 2], [True], [1, 2.5],
+                             [2 ** 64, 1]],
+                    {"a": {"a": ["a", "b", "a"]}}):
+            with self.subTest(obj=obj):
+                self.assertRoundTrip(obj)
+
+        self.assertIs(type(self.kim_edn.loadb_compact(
+            self.kim_edn.dumpb_compact([1.0, 2.0]))[0]), float)
+
+    def test_compactness(self):
+        # Packed runs use 8 bytes per number
+        floats = [i + 0.5 for i in range(100)]
+        self.assertEqual(len(self.assertRoundTrip(floats)), 5 + 2 + 800)
+        self.assertEqual(len(self.assertRoundTrip(list(range(100)))),
+                         5 + 2 + 800)
+
+        # Repeated strings are stored once
+        b = self.assertRoundTrip([{"species": "Al"} for _ in range(100)])
+        self.assertEqual(b.count(b'species'), 1)
+        self.assertEqual(b.count(b'Al'), 1)
+
+    def test_buffers(self):
+        obj = {"a": [1.5, 2.5], "b": "c"}
+        b = self.kim_edn.dumpb_compact(obj)
+        for buf in (bytearray(b), memoryview(b),
+                    memoryview(b'..' + b)[2:]):
+            self.assertEqual(self.kim_edn.loadb_compact(buf), obj)
+
+    def test_dump_errors(self):
+        dumpb_compact = self.kim_edn.dumpb_compact
+        for obj in (float('nan'), [1.0, float('inf')], [float('-inf')]):
+            with self.assertRaisesRegex(ValueError, 'Out of range'):
+                dumpb_compact(obj)
+        for obj in (None, (1, 2), {1: 2}, [b'a']):
+            with self.assertRaises(TypeError):
+                dumpb_compact(obj)
+
+        obj = []
+        obj.append(obj)
+        with self.assertRaisesRegex(ValueError, 'Circular reference'):
+            dumpb_compact(obj)
+
+    def test_load_errors(self):
+        b = self.kim_edn.dumpb_compact({"a": [1, "b", 2 ** 70, 1.5]})
+        for data, msg in ((b'', 'Not KIM-EDN'),
+                          (b'{"a" 1}', 'Not KIM-EDN'),
+                          (b'KEDC', 'version'),
+                          (b'KEDC\x02T', 'version'),
+                          (b'KEDC\x01x', 'Unknown tag'),
+                          (b + b'T', 'Extra data'),
+                          (b'KEDC\x01s\x02', 'Truncated')):
+            with self.subTest(data=data):
+                with self.assertRaisesRegex(ValueError, msg):
+                    self.kim_edn.loadb_compact(data)
+
+        for i in range(5, len(b)):
+            with self.assertRaises(ValueError):
+                self.kim_edn.loadb_compact(b[:i])
+
+
+class TestPyCompact(TestCompact, PyTest):
+    pass
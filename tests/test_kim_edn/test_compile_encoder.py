@@ -0,0 +1,84 @@
+import threading
+from tests.test_kim_edn import PyTest
+
+
+class TestCompileEncoder:
+    example = {
+        "property-id": "tag:brunnels@noreply.openkim.org,2016-05-11:property/atomic-mass",
+        "instance-id": 1,
+        "species": {"source-value": "Al"},
+        "mass": {"source-value": 26.9815385, "source-unit": "amu"},
+        "100%": True,
+    }
+
+    def records(self):
+        yield dict(self.example)
+        yield {**self.example, "instance-id": 2, "species": {"source-value": "Nï"}}
+        # value types which don't match the shape
+        yield {**self.example, "mass": {"source-value": 27, "source-unit": "amu"}}
+        yield {**self.example, "instance-id": True}
+        yield {**self.example, "species": {"source-value": ["Al", "Ni"]}}
+        # keys which don't match the shape
+        yield dict(reversed(list(self.example.items())))
+        yield {**self.example, "extra": [1, 2.5]}
+        yield {"instance-id": 1}
+        yield [self.example]
+        yield "Al"
+
+    def test_compile_encoder(self):
+        for sort_keys in (False, True):
+            for float_format in (None, 3):
+                encode = self.kim_edn.compile_encoder(self.example, sort_keys=sort_keys,
+                                                      float_format=float_format)
+                for record in self.records():
+                    self.assertEqual(encode(record),
+                                     self.dumps(record, sort_keys=sort_keys, float_format=float_format))
+
+    def test_schema(self):
+        encode = self.kim_edn.compile_encoder({"a": float, "b": list, "c": bool, "d": dict})
+        record = {"a": 1.5, "b": [1, "x"], "c": False, "d": {"e": 1}}
+        self.assertEqual(encode(record), '{"a" 1.5 "b" [1 "x"] "c" false "d" {"e" 1}}')
+        self.assertEqual(encode({"a": 1}), '{"a" 1}')
+
+    def test_errors(self):
+        encode = self.kim_edn.compile_encoder({"a": 1.0, "b": [1]})
+        self.assertRaises(ValueError, encode, {"a": float('nan'), "b": [1]})
+
+        x = []
+        x.append(x)
+        self.assertRaises(ValueError, encode, {"a": 1.0, "b": x})
+        # the circular reference markers are reset after an error
+        self.assertEqual(encode({"a": 1.0, "b": [[1]]}), '{"a" 1.0 "b" [[1]]}')
+
+        self.assertRaises(TypeError, self.kim_edn.compile_encoder, {})
+        self.assertRaises(TypeError, self.kim_edn.compile_encoder, {1: 1})
+        self.assertRaises(ValueError, self.kim_edn.KIMEDNEncoder(indent=2).record_encoder, {"a": 1})
+
+    def test_threads(self):
+        started = threading.Event()
+        resume = threading.Event()
+
+        def default(o):
+            # The thread stops in the middle of encoding the shared vector
+            if threading.current_thread() is thread:
+                started.set()
+                resume.wait(10)
+            return 0
+
+        encode = self.kim_edn.compile_encoder({"a": list}, default=default)
+        shared = [object()]
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(encode({"a": shared})))
+        thread.start()
+        started.wait(10)
+        try:
+            self.assertEqual(encode({"a": shared}), '{"a" [0]}')
+        finally:
+            resume.set()
+            thread.join()
+        self.assertEqual(results, ['{"a" [0]}'])
+
+
+class TestPyCompileEncoder(TestCompileEncoder, PyTest):
+    pass
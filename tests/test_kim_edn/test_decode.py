@@ -4,6 +4,7 @@ from collections import OrderedDict
 import pickle
 import sys
 from test import support
+import threading
 from tests.test_kim_edn import PyTest
 import unittest
 
@@ -84,6 +85,38 @@ class TestDecode:
 
         self.assertFalse(decoder.memo)
 
+    def test_reentrant_keys_reuse(self):
+        # A decode from a hook keeps its own memo of keys
+        def hook(obj):
+            decoder.decode('[0]')
+            return obj
+
+        decoder = self.kim_edn.decoder.KIMEDNDecoder(object_hook=hook)
+        s = '[{"a_key": 1, "b_\xe9": 2}, {"a_key": 3, "b_\xe9": 4}]'
+        self.check_keys_reuse(s, decoder.decode)
+
+    def test_threads(self):
+        docs = [f'{{"id" {i} "values" [{i}.5 "{i}"] "map" {{"id" {i}}}}}'
+                for i in range(200)]
+        expected = [{"id": i, "values": [i + 0.5, str(i)], "map": {"id": i}}
+                    for i in range(200)]
+        results = {}
+        barrier = threading.Barrier(4)
+
+        def decode(n):
+            barrier.wait()
+            results[n] = [self.loads(doc) for doc in docs * 5]
+
+        threads = [threading.Thread(target=decode, args=(n,))
+                   for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for n in range(4):
+            self.assertEqual(results[n], expected * 5)
+
     def test_extra_data(self):
         s = '[1, 2, 3]5'
         msg = 'Extra data'
@@ -1,4 +1,4 @@
-from io import StringIO
+from io import BytesIO, StringIO
 import os
 from tests.test_kim_edn import PyTest
 
@@ -18,6 +18,56 @@ class TestDump:
         self.assertEqual(self.kim_edn.load('{"1337" "true.edn"}'),
                          self.kim_edn.load(d[1337]))
 
+    def test_dump_buffer_size(self):
+        d = {"a": [1, 2.5, "x", {"b": [True, False]}], "c": "d" * 100}
+        expect = self.dumps(d, indent=2) + '\n'
+        for buffer_size in (0, 1, 7, 64, self.kim_edn.BUFFER_SIZE):
+            sio = StringIO()
+            self.kim_edn.dump(d, sio, indent=2, buffer_size=buffer_size)
+            self.assertEqual(sio.getvalue(), expect)
+
+        class Writer:
+            def __init__(self):
+                self.data = []
+
+            def write(self, s):
+                self.data.append(s)
+
+        fp = Writer()
+        self.kim_edn.dump(d, fp, indent=2, buffer_size=64)
+        self.assertEqual(''.join(fp.data), expect)
+        self.assertLess(len(fp.data), 10)
+
+    def test_dumpb(self):
+        d = {"a": [1, 2.5, "\u3053\u3093"], "b": {"c": True}}
+        for kw in ({}, {'indent': 2, 'sort_keys': True}):
+            for buffer_size in (1, 16, self.kim_edn.BUFFER_SIZE):
+                b = self.kim_edn.dumpb(d, buffer_size=buffer_size, **kw)
+                self.assertIsInstance(b, bytes)
+                self.assertEqual(b, self.dumps(d, **kw).encode('utf-8'))
+
+        self.assertEqual(self.kim_edn.dumpb({}), b'{}')
+
+    def test_dump_binary(self):
+        d = {"a": [1, 2.5, "x"]}
+        bio = BytesIO()
+        self.kim_edn.dump(d, bio, buffer_size=4)
+        self.assertEqual(bio.getvalue(), b'{"a" [1 2.5 "x"]}\n')
+
+        self.addCleanup(os.remove, "binary.edn")
+        with open("binary.edn", "wb") as fp:
+            self.kim_edn.dump(d, fp)
+
+        self.assertEqual(self.kim_edn.load("binary.edn"), d)
+
+        # A text file-like object whose mode is not a str
+        class Writer(StringIO):
+            mode = 1
+
+        fp = Writer()
+        self.kim_edn.dump(d, fp)
+        self.assertEqual(fp.getvalue(), '{"a" [1 2.5 "x"]}\n')
+
     def test_dumps(self):
         self.assertEqual(self.dumps({}), '{}')
 
@@ -30,6 +80,38 @@ class TestDump:
             {2: 3.0, 4.0: 5, False: 1, 6: True}, sort_keys=True),
             '{"false" 1 "2" 3.0 "4.0" 5 "6" true}')
 
+    def test_no_validate_keys(self):
+        d = {"b": {"c": 1.5}, "a": [{"d": True}]}
+        for kw in ({}, {'sort_keys': True}, {'indent': 2}):
+            self.assertEqual(self.dumps(d, validate_keys=False, check_circular=False, **kw),
+                             self.dumps(d, **kw))
+
+        sio = StringIO()
+        self.kim_edn.dump(d, sio, validate_keys=False, check_circular=False)
+        self.assertEqual(sio.getvalue(), self.dumps(d) + '\n')
+
+    def test_sort_keys_cache(self):
+        n = self.kim_edn.encoder.SORT_CACHE_MIN_KEYS + 4
+        keys = [f'k{i:02d}' for i in reversed(range(n))]
+        d = dict(zip(keys, range(n)))
+        expect = '{' + ' '.join(f'"{k}" {d[k]}' for k in sorted(keys)) + '}'
+        self.assertEqual(self.dumps(d, sort_keys=True), expect)
+        self.assertEqual(self.dumps(dict(zip(keys, range(n, 2 * n))), sort_keys=True),
+                         '{' + ' '.join(f'"{k}" {n + keys.index(k)}' for k in sorted(keys)) + '}')
+
+        # keys which compare equal share a cache entry but are written as is
+        a = {i: i for i in reversed(range(n))}
+        b = {(True if i == 1 else float(i) if i == 2 else i): i for i in reversed(range(n))}
+        self.assertIn('"1" 1 "2" 2', self.dumps(a, sort_keys=True))
+        self.assertIn('"true" 1 "2.0" 2', self.dumps(b, sort_keys=True))
+
+        # the values are the items of the map, as without the cache
+        class D(dict):
+            def __getitem__(self, key):
+                return 'wrong'
+
+        self.assertEqual(self.dumps(D(d), sort_keys=True), expect)
+
     def test_encode_evil_dict(self):
         class D(dict):
             def keys(self):
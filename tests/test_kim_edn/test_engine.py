@@ -0,0 +1,76 @@
+from collections import OrderedDict
+import decimal
+import glob
+from kim_edn import bridge
+from tests.test_kim_edn import PyTest
+from tests.test_kim_edn.test_comment import COMMENTEDDOC, DOC
+from tests.test_kim_edn.test_fail import FAILDOCS
+from tests.test_kim_edn.test_pass1 import DOCS as PASS1
+from tests.test_kim_edn.test_pass2 import DOCS as PASS2
+from tests.test_kim_edn.test_pass3 import DOCS as PASS3
+
+
+class TestEngine:
+    # Documents the pure-Python decoder reads in its own way
+    quirks = [
+        '{"x" 1 " a" 2}',
+        '{"a"x12}',
+        '[truefalse]',
+        '[1"a"]',
+        '[01]',
+        '[1-2]',
+        '{"a" 1,}',
+        '{"a":;c\n1}',
+        '["a\tb\nc"]',
+    ]
+
+    def assertSameResult(self, doc, **kw):
+        try:
+            expected = self.loads(doc, **kw)
+        except self.KIMEDNDecodeError as err:
+            with self.assertRaises(self.KIMEDNDecodeError) as cm:
+                self.loads(doc, engine='json', **kw)
+            self.assertEqual(str(cm.exception), str(err))
+        else:
+            result = self.loads(doc, engine='json', **kw)
+            self.assertEqual(result, expected)
+            self.assertEqual(repr(result), repr(expected))
+
+    def test_parity(self):
+        docs = [PASS1, PASS2, PASS3, DOC, COMMENTEDDOC] + FAILDOCS + self.quirks
+        for path in sorted(glob.glob('tests/fixtures/**/*.edn', recursive=True)):
+            with open(path, encoding='utf-8') as fp:
+                docs.append(fp.read())
+
+        for doc in docs:
+            with self.subTest(doc=doc):
+                self.assertSameResult(doc)
+
+    def test_hooks(self):
+        doc = '{"a" 1.10 "b" [2 3] "c" {"d" true}}'
+        self.assertSameResult(doc, parse_float=decimal.Decimal)
+        self.assertSameResult(doc, parse_int=float)
+        self.assertSameResult(doc, object_hook=lambda d: sorted(d))
+        self.assertSameResult(doc, object_pairs_hook=OrderedDict)
+
+    def test_to_json(self):
+        obj = {"a": [[0.5, -1e-05, 3], [True, False, "x y"]], "b": {}, "c": []}
+        for indent in (None, 4):
+            self.assertEqual(self.loads(bridge.to_json(self.dumps(obj, indent=indent)), engine='json'), obj)
+
+        self.assertEqual(bridge.to_json('; c\n{"a" : 1, "b"\n[1 2,3] ; d\n "c" "e"}'),
+                         '{"a":1,"b":[1,2,3],"c":"e"}')
+
+        unsupported = ['{"x" 1 " a" 2}', '{"a"x12}', '[truefalse]', '[01]',
+                       '[1] ; c', '{"a" ; c\n : 1}', '"abc', '[nil]', '"\x01"']
+        for doc in unsupported:
+            with self.subTest(doc=doc):
+                self.assertRaises(bridge.Unsupported, bridge.to_json, doc)
+
+    def test_bad_engine(self):
+        self.assertRaises(ValueError, self.loads, '1', engine='C')
+        self.assertRaises(ValueError, self.loads, '1', engine='json', cls=self.kim_edn.KIMEDNDecoder)
+
+
+class TestPyEngine(TestEngine, PyTest):
+    pass
@@ -13,6 +13,41 @@ class TestFloat:
             self.assertEqual(self.dumps(num), str(num))
             self.assertEqual(int(self.dumps(num)), num)
 
+    def test_numeric_vectors(self):
+        vect = [1, -2, 3.5, 1e-07, 1 << 64]
+        self.assertEqual(self.dumps(vect), '[1 -2 3.5 1e-07 18446744073709551616]')
+        self.assertEqual(self.dumps([vect], indent=1),
+                         '[\n [\n  1 \n  -2 \n  3.5 \n  1e-07 \n  18446744073709551616\n ]\n]')
+        self.assertEqual(self.dumps([1, True, 2.0]), '[1 true 2.0]')
+        # finite values whose sum overflows
+        self.assertEqual(self.dumps([1e308, 1e308]), '[1e+308 1e+308]')
+        self.assertEqual(self.dumps([1 << 1100, 1.0]), '[' + str(1 << 1100) + ' 1.0]')
+        self.assertRaises(ValueError, self.dumps, [1.0, float('inf'), float('-inf')])
+
+    def test_float_format(self):
+        vect = [0.1 + 0.2, 2, 1.0, -3.0, 1e16]
+        self.assertEqual(self.dumps(vect, float_format='.8g'), '[0.3 2 1.0 -3.0 1e+16]')
+        self.assertEqual(self.dumps(vect, float_format=3), '[0.3 2 1.0 -3.0 1e+16]')
+        self.assertEqual(self.dumps(vect, float_format='.3f'), '[0.300 2 1.000 -3.000 10000000000000000.000]')
+        self.assertEqual(self.dumps({'e': 0.30000000000000004}, float_format=lambda o: '%.2e' % o), '{"e" 3.00e-01}')
+        self.assertEqual(self.loads(self.dumps(vect, float_format='.8g')), [0.3, 2, 1.0, -3.0, 1e16])
+        self.assertEqual(self.dumps([[0.30000000000000004, True]], float_format=2), '[[0.3 true]]')
+
+        for val in (float('inf'), float('-inf'), float('nan')):
+            self.assertRaises(ValueError, self.dumps, val, float_format=8)
+            self.assertRaises(ValueError, self.dumps, [1.0, val], float_format=8)
+
+        self.assertRaises(ValueError, self.dumps, 1.0, float_format=0)
+        self.assertRaises(ValueError, self.dumps, 1.0, float_format='.8q')
+        self.assertEqual(self.dumps([1.5, 1e16], float_format='.2E'), '[1.50E+00 1.00E+16]')
+        self.assertEqual(self.dumps([1.5], float_format=''), '[1.5]')
+        # specs whose output is not a KIM-EDN number
+        for spec in ('.1%', ',.2f', '_.2f', 'n', '.3n', '>12', '012.3f', '+.3g', ' g',
+                     '#.0f', 'z.1f'):
+            with self.assertRaises(ValueError):
+                self.dumps([1.5, 2.5], float_format=spec)
+        self.assertRaises(TypeError, self.dumps, 1.0, float_format=8.0)
+
     def test_out_of_range(self):
         self.assertEqual(self.loads('[23456789012E666]'), [float('inf')])
         self.assertEqual(self.loads('[-23456789012E666]'), [float('-inf')])
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+from tests.test_kim_edn import PyTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestImport:
+    def run_python(self, code):
+        return subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                              check=True, capture_output=True,
+                              text=True).stdout.split()
+
+    def test_lazy_modules(self):
+        code = ('import sys, kim_edn; print(*sorted(name for name in sys.modules '
+                'if name == "asyncio" or name.startswith("kim_edn.")))')
+        self.assertEqual(self.run_python(code),
+                         ['kim_edn._util', 'kim_edn.decoder', 'kim_edn.encoder',
+                          'kim_edn.scanner'])
+
+    def test_lazy_names(self):
+        code = ('import sys, kim_edn; print(kim_edn.__version__ == '
+                'kim_edn._version.get_versions()["version"], '
+                'kim_edn.DocumentCache.__module__, kim_edn.aload.__module__, '
+                '"kim_edn.compact" in sys.modules, "loadb_compact" in dir(kim_edn))')
+        self.assertEqual(self.run_python(code),
+                         ['True', 'kim_edn.cache', 'kim_edn.aio', 'False', 'True'])
+
+        with self.assertRaises(AttributeError):
+            self.kim_edn.no_such_name
+
+
+class TestPyImport(TestImport, PyTest):
+    pass
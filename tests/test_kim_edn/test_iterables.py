@@ -0,0 +1,57 @@
+from io import StringIO
+import itertools
+import types
+from tests.test_kim_edn import PyTest
+
+
+class TestIterables:
+    def test_not_streamed_by_default(self):
+        self.assertRaises(TypeError, self.dumps, (i for i in range(3)))
+        self.assertRaises(TypeError, self.dumps, {"a": map(str, range(3))})
+
+    def test_stream_iterables(self):
+        def records():
+            for i in range(3):
+                yield {"instance-id": i, "coords": (x * 0.5 for x in range(i))}
+
+        expect = [{"instance-id": i, "coords": [x * 0.5 for x in range(i)]} for i in range(3)]
+        for kw in ({}, {'indent': 2}, {'indent': 0, 'sort_keys': True}):
+            self.assertEqual(self.dumps(records(), stream_iterables=True, **kw),
+                             self.dumps(expect, **kw))
+
+        self.assertEqual(self.dumps(iter([]), stream_iterables=True), '[]')
+        self.assertEqual(self.dumps([()], stream_iterables=True, indent=2), '[\n  []\n]')
+        self.assertEqual(self.dumps(itertools.chain([1], ["a"]), stream_iterables=True), '[1 "a"]')
+        self.assertEqual(self.dumps(("a", (1, 2.5)), stream_iterables=True), '["a" [1 2.5]]')
+        self.assertRaises(TypeError, self.dumps, [b"bytes"], stream_iterables=True)
+
+        sio = StringIO()
+        self.kim_edn.dump(map(str, range(3)), sio, stream_iterables=True)
+        self.assertEqual(sio.getvalue(), '["0" "1" "2"]\n')
+
+    def test_mappings_and_sets_not_streamed(self):
+        proxy = types.MappingProxyType({"a": 1})
+        for o in (proxy, {1, 2}, frozenset([1])):
+            self.assertRaises(TypeError, self.dumps, o, stream_iterables=True)
+
+        self.assertEqual(self.dumps([proxy], stream_iterables=True, default=dict),
+                         '[{"a" 1}]')
+
+    def test_lazy(self):
+        consumed = []
+
+        def items():
+            for i in range(3):
+                consumed.append(i)
+                yield i
+
+        chunks = self.kim_edn.KIMEDNEncoder(stream_iterables=True).iterencode(items())
+        self.assertEqual(next(chunks), '[0')
+        self.assertEqual(consumed, [0])
+        self.assertEqual(next(chunks), ' 1')
+        self.assertEqual(consumed, [0, 1])
+        self.assertEqual(''.join(chunks), ' 2]')
+
+
+class TestPyIterables(TestIterables, PyTest):
+    pass
@@ -0,0 +1,99 @@
+from io import BytesIO, StringIO
+import os
+from tests.test_kim_edn import PyTest
+
+
+class TestLines:
+    objs = [
+        {"ingredients": ["frog", "water", "chocolate", "glucose"]},
+        {"ingredients": ["chocolate", "steel bolts"], "note": "two\nlines"},
+        [1, 2.5, True],
+        "text",
+    ]
+
+    def expect(self, **kw):
+        return ''.join(self.dumps(obj, **kw) + '\n' for obj in self.objs)
+
+    def test_dump_lines(self):
+        sio = StringIO()
+        self.kim_edn.dump_lines(self.objs, sio)
+        self.assertEqual(sio.getvalue(), self.expect())
+        self.assertEqual(len(sio.getvalue().splitlines()), len(self.objs))
+
+        sio = StringIO()
+        self.kim_edn.dump_lines(iter(self.objs), sio, sort_keys=True, float_format=2, buffer_size=1)
+        self.assertEqual(sio.getvalue(), self.expect(sort_keys=True, float_format=2))
+
+        bio = BytesIO()
+        self.kim_edn.dump_lines(self.objs, bio)
+        self.assertEqual(bio.getvalue(), self.expect().encode())
+
+        path = 'lines.edn'
+        self.addCleanup(os.remove, path)
+        self.kim_edn.dump_lines(self.objs, path)
+        with open(path, encoding='utf-8') as fp:
+            self.assertEqual(fp.read(), self.expect())
+
+    def test_dump_lines_cls(self):
+        class Encoder(self.kim_edn.KIMEDNEncoder):
+            def iterencode(self, o):
+                yield from super().iterencode(o)
+                yield ' ; checked'
+
+        sio = StringIO()
+        self.kim_edn.dump_lines(self.objs[:2], sio, cls=Encoder)
+        self.assertEqual(sio.getvalue(),
+                         ''.join(self.dumps(obj) + ' ; checked\n'
+                                 for obj in self.objs[:2]))
+
+    def test_dump_lines_empty(self):
+        sio = StringIO()
+        self.kim_edn.dump_lines([], sio)
+        self.assertEqual(sio.getvalue(), '')
+
+    def test_load_lines(self):
+        sio = StringIO()
+        self.kim_edn.dump_lines(self.objs, sio)
+        text = sio.getvalue()
+
+        self.assertEqual(list(self.kim_edn.load_lines(StringIO(text))), self.objs)
+        self.assertEqual(list(self.kim_edn.load_lines(BytesIO(text.encode()))), self.objs)
+        self.assertEqual(list(self.kim_edn.load_lines(text.splitlines())), self.objs)
+
+        path = 'lines.edn'
+        self.addCleanup(os.remove, path)
+        self.kim_edn.dump_lines(self.objs, path)
+        self.assertEqual(list(self.kim_edn.load_lines(path)), self.objs)
+
+        objs = self.kim_edn.load_lines(StringIO('{"a" 1.5}\n'), parse_float=str)
+        self.assertEqual(list(objs), [{"a": "1.5"}])
+
+    def test_load_lines_lazy(self):
+        lines = iter(['[1]\n', '[2\n', '[3]\n'])
+        objs = self.kim_edn.load_lines(lines)
+        self.assertEqual(next(objs), [1])
+        self.assertRaises(self.KIMEDNDecodeError, next, objs)
+        self.assertEqual(next(lines), '[3]\n')
+
+    def test_load_lines_skip_empty(self):
+        text = '\n[1]\n  \n; a comment\n ,; another\n[2] \n'
+        self.assertEqual(list(self.kim_edn.load_lines(StringIO(text))), [[1], [2]])
+
+        with self.assertRaises(self.KIMEDNDecodeError) as cm:
+            list(self.kim_edn.load_lines(StringIO(text), skip_empty=False))
+
+        self.assertIn('line 1)', str(cm.exception))
+
+    def test_load_lines_error(self):
+        with self.assertRaises(self.KIMEDNDecodeError) as cm:
+            list(self.kim_edn.load_lines(StringIO('[1]\n\n[2]\n{"a" }\n')))
+
+        self.assertIn('(KIM-EDN lines, line 4)', str(cm.exception))
+        self.assertEqual(cm.exception.doc, '{"a" }\n')
+
+    def test_dump_lines_indent(self):
+        self.assertRaises(ValueError, self.kim_edn.dump_lines, self.objs, StringIO(), indent=2)
+
+
+class TestPyLines(TestLines, PyTest):
+    pass
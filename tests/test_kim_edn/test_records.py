@@ -0,0 +1,150 @@
+from collections import namedtuple, OrderedDict
+import dataclasses
+import io
+import os
+import tempfile
+from tests.test_kim_edn import PyTest
+
+Value = namedtuple('Value', ['source_value', 'source_unit'], defaults=[None])
+Tagged = namedtuple('Tagged', ['property_id', 'source_value'])
+
+
+@dataclasses.dataclass
+class Point:
+    __slots__ = ('x', 'y')
+    x: float
+    y: float
+
+
+class AtomicMass:
+    __slots__ = ('property_id', 'instance_id', 'species', 'mass')
+
+    def __init__(self, property_id, instance_id, species, mass):
+        self.property_id = property_id
+        self.instance_id = instance_id
+        self.species = species
+        self.mass = mass
+
+
+ATOMIC_MASS = 'tag:brunnels@noreply.openkim.org,2016-05-11:property/atomic-mass'
+
+DOC = f'''[
+    {{"property-id" "{ATOMIC_MASS}"
+     "instance-id" 1
+     "species" {{"source-value" "Al"}}
+     "mass" {{"source-value" 26.98 "source-unit" "amu"}}}}
+    {{"x" 1.5 "y" 2}}
+    {{"y" 3 "x" 4}}
+    {{"x" 1 "y" 2 "z" 3}}
+]'''
+
+RECORD_TYPES = {
+    ATOMIC_MASS: AtomicMass,
+    frozenset(['source-value']): Value,
+    frozenset(['source-value', 'source-unit']): Value,
+    frozenset(['x', 'y']): Point,
+}
+
+
+class TestRecords:
+    def check(self, result):
+        mass, p, q, other = result
+        self.assertIsInstance(mass, AtomicMass)
+        self.assertEqual((mass.property_id, mass.instance_id),
+                         (ATOMIC_MASS, 1))
+        self.assertEqual(mass.species, Value('Al'))
+        self.assertEqual(mass.mass, Value(26.98, 'amu'))
+        self.assertEqual((p, q), (Point(1.5, 2), Point(4, 3)))
+        return other
+
+    def test_record_types(self):
+        other = self.check(self.loads(DOC, record_types=RECORD_TYPES))
+        self.assertEqual(other, {"x": 1, "y": 2, "z": 3})
+
+        other = self.check(self.loads(DOC, record_types=RECORD_TYPES,
+                                      engine='json'))
+        self.assertEqual(other, {"x": 1, "y": 2, "z": 3})
+
+        other = self.check(self.kim_edn.load(io.StringIO(DOC),
+                                             record_types=RECORD_TYPES))
+        self.assertEqual(other, {"x": 1, "y": 2, "z": 3})
+
+        lines = [self.dumps(obj) for obj in self.loads(DOC)]
+        result = list(self.kim_edn.load_lines(lines,
+                                              record_types=RECORD_TYPES))
+        self.assertEqual(self.check(result), {"x": 1, "y": 2, "z": 3})
+
+    def test_other_hooks(self):
+        other = self.check(self.loads(DOC, record_types=RECORD_TYPES,
+                                      object_pairs_hook=OrderedDict))
+        self.assertIsInstance(other, OrderedDict)
+
+        other = self.check(self.loads(DOC, record_types=RECORD_TYPES,
+                                      object_hook=sorted))
+        self.assertEqual(other, ['x', 'y', 'z'])
+
+        decoder = self.kim_edn.KIMEDNDecoder(record_types=RECORD_TYPES)
+        other = self.check(decoder.decode(DOC))
+        self.assertEqual(other, {"x": 1, "y": 2, "z": 3})
+        self.assertIs(decoder.record_types, RECORD_TYPES)
+
+    def test_property_id_priority(self):
+        record_types = {'tagged': Tagged,
+                        frozenset(['property-id', 'source-value']): Value}
+        self.assertEqual(
+            self.loads('[{"property-id" "tagged" "source-value" 1} '
+                       '{"property-id" 1 "source-value" 1}]',
+                       record_types={'tagged': Tagged}),
+            [Tagged('tagged', 1), {"property-id": 1, "source-value": 1}])
+
+        self.assertEqual(
+            self.loads('{"source-value" 1 "property-id" "tagged"}',
+                       record_types=record_types),
+            Tagged('tagged', 1))
+
+        with self.assertRaises(TypeError):
+            self.loads('{"property-id" "other" "source-value" 1}',
+                       record_types=record_types)
+
+    def test_fields(self):
+        class Keywords:
+            def __init__(self, **kw):
+                self.kw = kw
+
+        record = self.loads('{"source-unit" "eV" "b" 1}', record_types={
+            frozenset(['source-unit', 'b']): Keywords})
+        self.assertEqual(record.kw, {"source_unit": "eV", "b": 1})
+
+        for key in ('source value', '1st', 'class'):
+            with self.assertRaisesRegex(TypeError, f"key '{key}', which is not a valid field name"):
+                self.loads(f'{{"{key}" 1}}', record_types={frozenset([key]): Value})
+
+        with self.assertRaisesRegex(TypeError, "field 'source_value' is missing"):
+            self.loads('{"source-unit" "eV"}', record_types={frozenset(['source-unit']): Value})
+
+        with self.assertRaisesRegex(TypeError, "it has no field 'z'"):
+            self.loads('{"x" 1 "y" 2 "z" 3}', record_types={frozenset(['x', 'y', 'z']): Point})
+
+    def test_cache(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'species.edn')
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write('{"species" {"source-value" "Al"}}')
+
+        cache = self.kim_edn.DocumentCache()
+        plain = self.kim_edn.load(path, cache=cache)
+        records = self.kim_edn.load(path, cache=cache, record_types={
+            frozenset(['source-value']): Value})
+        self.assertEqual(plain, {"species": {"source-value": "Al"}})
+        self.assertEqual(records, {"species": Value('Al')})
+        self.assertIsInstance(records['species'], Value)
+        self.assertEqual(cache.misses, 2)
+
+        with self.assertRaises(ValueError):
+            self.kim_edn.load(path, disk_cache='unused', record_types={
+                frozenset(['source-value']): Value})
+
+
+class TestPyRecords(TestRecords, PyTest):
+    pass
@@ -75,6 +75,17 @@ class TestRecursion:
         else:
             self.fail("didn't raise ValueError on default recursion")
 
+    def test_no_check_circular(self):
+        x = []
+        x.append(x)
+
+        with self.assertRaises(RecursionError):
+            self.dumps(x, check_circular=False)
+
+        y = {"a": [1, 2.5], "b": {"c": [True, "d"]}}
+        self.assertEqual(self.dumps(y, check_circular=False), self.dumps(y))
+        self.assertEqual(self.dumps([y, y], check_circular=False), self.dumps([y, y]))
+
     def test_highly_nested_objects_decoding(self):
         # test that loading highly-nested objects doesn't segfault
         with self.assertRaises(RecursionError):
@@ -0,0 +1,118 @@
+from io import StringIO
+from kim_edn.reformat import reformat
+from tests.test_kim_edn import PyTest
+
+
+class TestReformat:
+    doc = {
+        "property-id": "tag:staff@noreply.openkim.org,2014-04-15:property/cohesive-energy",
+        "instance-id": 1,
+        "empty": [[], {}],
+        "a": {"source-value": [[0.0, 0.5, 1e-05], [True, False, "x\"y"]], "source-unit": "eV"},
+    }
+
+    def reformat(self, s, **kw):
+        sio = StringIO()
+        reformat(StringIO(s), sio, **kw)
+        return sio.getvalue()
+
+    def test_layout(self):
+        src = self.dumps(self.doc, indent=3)
+        for indent in (None, 0, 2, 4, '\t'):
+            for read_size in (1, 7, 1 << 16):
+                self.assertEqual(self.reformat(src, indent=indent, read_size=read_size),
+                                 self.dumps(self.doc, indent=indent) + '\n')
+
+    def test_separators(self):
+        src = '{"a" : [1, 2\t3],"b":\n{"c": true}}'
+        self.assertEqual(self.reformat(src), '{"a" [1 2 3] "b" {"c" true}}\n')
+
+    def test_numbers_and_strings_verbatim(self):
+        src = '[1.000 -0 2E+5 1e400 "\\u00e9" "é"]'
+        self.assertEqual(self.reformat(src, end=''), src)
+
+    def test_comments(self):
+        src = '; header\n{\n  ; own line\n  "a" 1 ; trailing\n  "b" [2 ; two\n]}'
+        self.assertEqual(self.reformat(src, indent=2), (
+            '; header\n'
+            '{\n'
+            '  ; own line\n'
+            '  "a" 1 ; trailing\n'
+            '  "b" [\n'
+            '    2 ; two\n'
+            '  ]\n'
+            '}\n'))
+        self.assertEqual(self.reformat(src), (
+            '; header\n'
+            '{\n'
+            '; own line\n'
+            '"a" 1 ; trailing\n'
+            '"b" [2 ; two\n'
+            ']}\n'))
+        self.assertEqual(self.reformat(src, indent=2, strip_comments=True),
+                         self.dumps({"a": 1, "b": [2]}, indent=2) + '\n')
+        self.assertEqual(self.loads(self.reformat(src)), {"a": 1, "b": [2]})
+
+    def test_edn_lines(self):
+        src = '{"a": 1}\n\n; comment\n[1, 2]\n'
+        self.assertEqual(self.reformat(src, edn_lines=True, strip_comments=True),
+                         '{"a" 1}\n[1 2]\n')
+        self.assertEqual(self.reformat('', edn_lines=True), '')
+        self.assertRaises(self.KIMEDNDecodeError, self.reformat, src)
+
+    def test_loads_parity(self):
+        # Malformed input is rejected exactly when loads rejects it
+        test_cases = [
+            '{"a"1}', '{"a"[1]}', '{"a" 1 "b"2}', '0;x\n', '{"a" ;c\n :1}',
+            '[1.]', '[1e]', '[1-2]', '[01]', '[true-23.5]', '[truefalse"x"1.5e3]',
+            '{"a"x1}', '{"a";1}', '{"a"}1}', '{"a" :1}', '{"a" ;c\n 1}', '{"a" 1"b" 2}',
+        ]
+        for data in test_cases:
+            try:
+                expect = self.loads(data)
+            except self.KIMEDNDecodeError:
+                expect = None
+            for read_size in (1, 3, 1 << 16):
+                if expect is None:
+                    self.assertRaises(self.KIMEDNDecodeError, self.reformat,
+                                      data, read_size=read_size)
+                else:
+                    self.assertEqual(self.loads(self.reformat(data, read_size=read_size)),
+                                     expect)
+
+        src = '[1]\n; c\n{"a"1}\n'
+        self.assertRaises(self.KIMEDNDecodeError, list, self.kim_edn.load_lines(StringIO(src)))
+        self.assertRaises(self.KIMEDNDecodeError, self.reformat, src, edn_lines=True)
+        for src in ('[1\n2]\n', '[1] [2]\n', '[1] ; c\n'):
+            self.assertRaises(self.KIMEDNDecodeError, list, self.kim_edn.load_lines(StringIO(src)))
+            self.assertRaises(self.KIMEDNDecodeError, self.reformat, src, edn_lines=True)
+
+    def test_errors(self):
+        test_cases = [
+            ('', 'Expecting value', 0),
+            ('[1 2', "Expecting ']' delimiter", 4),
+            ('[1 2]]', "Unexpected ']'", 5),
+            ('[1 2}', "Unexpected '}'", 4),
+            ('[1] 2', 'Extra data', 4),
+            ('{1 2}', 'Expecting property name enclosed in double quotes', 1),
+            ('{"a"}', 'Expecting value', 5),
+            ('{"a" : : 1}', "Unexpected ':'", 7),
+            ('[1 : 2]', "Unexpected ':'", 3),
+            ('[1\n\n  nil]', 'Expecting value', 6),
+            ('["abc', 'Unterminated string starting at', 1),
+            ('[1] ; c', 'Extra data', 4),
+            ('{"a"[1]}', "Unexpected ']'", 6),
+        ]
+        for data, msg, idx in test_cases:
+            for read_size in (1, 1 << 16):
+                with self.assertRaises(self.KIMEDNDecodeError) as cm:
+                    self.reformat(data, read_size=read_size)
+                err = cm.exception
+                self.assertEqual(err.msg, msg)
+                self.assertEqual(err.pos, idx)
+                self.assertEqual(err.lineno, data.count('\n', 0, idx) + 1)
+                self.assertEqual(err.colno, idx - data.rfind('\n', 0, idx))
+
+
+class TestPyReformat(TestReformat, PyTest):
+    pass
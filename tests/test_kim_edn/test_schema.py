@@ -0,0 +1,251 @@
+import io
+import os
+import tempfile
+from kim_edn.schema import PropertySchema
+from tests.test_kim_edn import PyTest
+
+DEFINITION = '''{
+  "property-id" "tag:staff@noreply.openkim.org,2014-04-15:property/structure-cubic-crystal-npt"
+  "property-title" "Crystal structure (cubic)"
+  "property-description" "A cubic crystal structure"
+  "a" {"type" "float" "has-unit" true "extent" [] "required" true}
+  "species" {"type" "string" "has-unit" false "extent" [":"] "required" true}
+  "basis-atom-coordinates" {
+    "type" "float" "has-unit" false "extent" [":" 3] "required" true}
+  "wyckoff-multiplicity-and-letter" {
+    "type" "string" "has-unit" false "extent" [":"] "required" false}
+  "space-group" {"type" "int" "has-unit" false "extent" [] "required" false}
+  "short-name" {"type" "string" "has-unit" false "extent" [] "required" false}
+  "periodic" {"type" "bool" "has-unit" false "extent" [3] "required" false}
+}'''
+
+INSTANCE = '''{
+  "property-id" "tag:staff@noreply.openkim.org,2014-04-15:property/structure-cubic-crystal-npt"
+  "instance-id" 1
+  ; The lattice constant
+  "a" {"source-value" 4.05 "source-unit" "angstrom"}
+  "species" {"source-value" ["Al" "Al" "Al" "Al"]}
+  "basis-atom-coordinates" {
+    "source-value" [[0 0 0] [0 0.5 0.5] [0.5 0 0.5] [0.5 0.5 0]]}
+  "space-group" {"source-value" 225}
+  "periodic" {"source-value" [true true true]}
+}'''
+
+
+class DType:
+    def __init__(self, kind):
+        self.kind = kind
+
+
+class Array:
+    """An object with the array attributes of a NumPy array."""
+
+    def __init__(self, values, shape, kind):
+        self.values = values
+        self.shape = shape
+        self.dtype = DType(kind)
+
+    def tolist(self):
+        return self.values
+
+
+class TestSchema:
+    def setUp(self):
+        self.schema = self.loads(DEFINITION)
+
+    def check_error(self, doc, msg, pos):
+        with self.assertRaises(self.KIMEDNDecodeError) as cm:
+            self.loads(doc, schema=self.schema)
+        self.assertEqual(cm.exception.msg, msg)
+        self.assertEqual(cm.exception.pos, pos)
+
+    def test_valid(self):
+        expected = self.loads(INSTANCE)
+        self.assertEqual(self.loads(INSTANCE, schema=self.schema), expected)
+        self.assertEqual(self.kim_edn.load(io.StringIO(INSTANCE),
+                                           schema=self.schema), expected)
+        self.assertEqual(self.loads('; An instance\n' + INSTANCE + '\n',
+                                    schema=self.schema), expected)
+
+        compiled = PropertySchema(self.schema)
+        self.assertEqual(self.loads(INSTANCE, schema=compiled), expected)
+
+        lines = [self.dumps(expected)] * 3
+        self.assertEqual(
+            list(self.kim_edn.load_lines(lines, schema=self.schema)),
+            [expected] * 3)
+
+    def test_invalid(self):
+        pos = INSTANCE.index('4.05') - len('{"source-value" ')
+        self.check_error(INSTANCE.replace(' "source-unit" "angstrom"', ''),
+                         'Invalid \'a\': missing "source-unit"', pos)
+        self.check_error(INSTANCE.replace('"angstrom"', '1'),
+                         'Invalid \'a\': "source-unit" is not a string', pos)
+
+        self.check_error(INSTANCE.replace('[0 0.5 0.5]', '[0 0.5]'),
+                         'Invalid \'basis-atom-coordinates\': '
+                         '"source-value" is not of type float and '
+                         'extent [\':\', 3]',
+                         INSTANCE.index('{\n    "source-value" [[0'))
+
+        self.check_error(INSTANCE.replace('225', '225.0'),
+                         'Invalid \'space-group\': "source-value" is not of '
+                         'type int and extent []',
+                         INSTANCE.index('{"source-value" 225'))
+
+        self.check_error(INSTANCE.replace('[true true true]',
+                                          '[true 1 true]'),
+                         'Invalid \'periodic\': "source-value" is not of '
+                         'type bool and extent [3]',
+                         INSTANCE.index('{"source-value" [true'))
+
+        self.check_error(INSTANCE.replace('"instance-id" 1',
+                                          '"instance-id" "1"'),
+                         "Invalid 'instance-id': expecting an integer",
+                         INSTANCE.index('1\n'))
+
+        self.check_error(INSTANCE.replace('"a" {', '"b" {'),
+                         "Invalid 'b': unknown key",
+                         INSTANCE.index('{"source-value" 4.05'))
+
+        self.check_error(INSTANCE.replace('"species" {"source-value" ',
+                                          '"species" {"value" '),
+                         'Invalid \'species\': missing "source-value"',
+                         INSTANCE.index('{"source-value" ["Al"'))
+
+        self.check_error(INSTANCE.replace('structure-cubic', 'structure-fcc'),
+                         "Invalid 'property-id': expecting "
+                         f"{self.schema['property-id']!r}",
+                         INSTANCE.index('"tag:'))
+
+        doc = INSTANCE.replace('"instance-id" 1', '')
+        self.check_error(doc, "Missing required keys 'instance-id'",
+                         len(doc) - 1)
+
+        self.check_error('[1 2]', 'Expecting property instance', 0)
+
+    def test_fail_early(self):
+        # The invalid key stops the decoding before the malformed rest
+        self.check_error(INSTANCE.replace('"space-group"', '"space group"')
+                         .replace('"periodic"', 'periodic'),
+                         "Invalid 'space group': unknown key",
+                         INSTANCE.index('{"source-value" 225'))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.loads(INSTANCE, schema=self.schema, object_hook=dict)
+
+        with self.assertRaises(ValueError):
+            self.loads(INSTANCE, schema=self.schema, engine='json')
+
+        with self.assertRaises(ValueError):
+            self.kim_edn.load(io.StringIO(INSTANCE), schema=self.schema,
+                              disk_cache='unused')
+
+        for definition in ({}, {"property-id": "p", "a": {"type": "complex"}},
+                           {"property-id": "p",
+                            "a": {"type": "int", "extent": [-1]}}):
+            with self.assertRaises(ValueError):
+                self.loads(INSTANCE, schema=definition)
+
+    def test_cache(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'instance.edn')
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write(INSTANCE)
+
+        cache = self.kim_edn.DocumentCache()
+        first = self.kim_edn.load(path, cache=cache, schema=self.schema)
+        second = self.kim_edn.load(path, cache=cache,
+                                   schema=self.loads(DEFINITION))
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestValidator:
+    def setUp(self):
+        self.schema = self.loads(DEFINITION)
+        self.validate = self.kim_edn.compile_validator(self.schema)
+
+    def check_error(self, instance, msg):
+        with self.assertRaises(ValueError) as cm:
+            self.validate(instance)
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_valid(self):
+        instance = self.loads(INSTANCE)
+        self.assertIsNone(self.validate(instance))
+        self.assertIsNone(
+            self.kim_edn.compile_validator(PropertySchema(self.schema))(
+                instance))
+
+        instance['a']['source-value'] = 4
+        self.assertIsNone(self.validate(instance))
+
+    def test_invalid(self):
+        instance = self.loads(INSTANCE)
+        del instance['a']['source-unit']
+        self.check_error(instance, 'Invalid \'a\': missing "source-unit"')
+
+        instance = self.loads(INSTANCE)
+        instance['a']['source-unit'] = None
+        self.check_error(instance, 'Invalid \'a\': "source-unit" is not a string')
+
+        instance = self.loads(INSTANCE)
+        instance['species']['source-value'].append(1)
+        self.check_error(instance, 'Invalid \'species\': "source-value" is '
+                         'not of type string and extent [\':\']')
+
+        instance = self.loads(INSTANCE)
+        instance['space-group']['source-value'] = True
+        self.check_error(instance, 'Invalid \'space-group\': "source-value" '
+                         'is not of type int and extent []')
+
+        instance = self.loads(INSTANCE)
+        instance['other'] = {}
+        self.check_error(instance, "Invalid 'other': unknown key")
+
+        instance = self.loads(INSTANCE)
+        del instance['species'], instance['a']
+        self.check_error(instance, "Missing required keys 'a', 'species'")
+
+        self.check_error([], 'Invalid property instance, expecting a map')
+
+    def test_arrays(self):
+        instance = self.loads(INSTANCE)
+        coordinates = instance['basis-atom-coordinates']
+        validate = self.validate
+
+        coordinates['source-value'] = Array(None, (4, 3), 'f')
+        self.assertIsNone(validate(instance))
+        coordinates['source-value'] = Array(None, (4, 3), 'i')
+        self.assertIsNone(validate(instance))
+        coordinates['source-value'] = [Array(None, (3,), 'f')] * 4
+        self.assertIsNone(validate(instance))
+        coordinates['source-value'] = Array([[0.5, 0.5, 0.5]], (1, 3), 'O')
+        self.assertIsNone(validate(instance))
+
+        for value in (Array(None, (4, 2), 'f'), Array(None, (12,), 'f'),
+                      Array(None, (4, 3), 'U'),
+                      Array([[0.5, '0.5', 0.5]], (1, 3), 'O')):
+            coordinates['source-value'] = value
+            with self.assertRaises(ValueError):
+                validate(instance)
+
+        instance['periodic']['source-value'] = Array(None, (3,), 'b')
+        instance['species']['source-value'] = Array(None, (4,), 'U')
+        coordinates['source-value'] = Array(None, (4, 3), 'f')
+        self.assertIsNone(validate(instance))
+
+        instance['periodic']['source-value'] = Array(None, (3,), 'i')
+        with self.assertRaises(ValueError):
+            validate(instance)
+
+
+class TestPySchema(TestSchema, PyTest):
+    pass
+
+
+class TestPyValidator(TestValidator, PyTest):
+    pass
@@ -1,6 +1,8 @@
+import json
 import os
 import subprocess
 import sys
+import tempfile
 from tests.test_kim_edn import PyTest
 import textwrap
 import unittest
@@ -167,6 +169,193 @@ class TestTool:
         self.assertEqual(process.stdout, self.ednlines_expect)
         self.assertEqual(process.stderr, '')
 
+    def test_edn_lines_infile(self):
+        infile = self._create_infile(self.ednlines_raw + '\n; a comment\n')
+        args = sys.executable, '-m', 'kim_edn.tool', '--edn-lines', infile
+        process = subprocess.run(args, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, self.ednlines_expect)
+        self.assertEqual(process.stderr, '')
+
+    def test_edn_lines_in_place(self):
+        infile = self._create_infile(self.ednlines_raw)
+        args = sys.executable, '-m', 'kim_edn.tool', '--edn-lines', '--compact', infile, infile
+        process = subprocess.run(args, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        with open(infile, "r", encoding="utf-8") as fp:
+            self.assertEqual(fp.read(), self.ednlines_raw.replace(':', ' ').replace(',', ' ').replace('\n', '\n\n'))
+
+    def test_edn_lines_jobs(self):
+        data = self.ednlines_raw * 1500
+        args = sys.executable, '-m', 'kim_edn.tool', '--edn-lines', '--jobs', '2'
+        process = subprocess.run(args, input=data, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, self.ednlines_expect * 1500)
+        self.assertEqual(process.stderr, '')
+
+    def test_edn_lines_jobs_error(self):
+        data = self.ednlines_raw * 1000 + '{1.2 3.4}\n' + self.ednlines_raw
+        args = sys.executable, '-m', 'kim_edn.tool', '--edn-lines', '--jobs', '2'
+        process = subprocess.run(args, input=data, capture_output=True, text=True)
+
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIn('(KIM-EDN lines, line 2001)', process.stderr)
+
+    def test_jobs_without_edn_lines(self):
+        args = sys.executable, '-m', 'kim_edn.tool', '--jobs', '2'
+        process = subprocess.run(args, input=self.data, capture_output=True, text=True)
+
+        self.assertEqual(process.returncode, 2)
+        self.assertIn('--jobs needs --edn-lines, --check or --in-place', process.stderr)
+
+    def _create_tree(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        os.mkdir(os.path.join(tmpdir.name, 'sub'))
+        files = {
+            'a.edn': self.data,
+            'b.edn': self.expect,
+            os.path.join('sub', 'c.edn'): '{1.2 3.4}',
+            os.path.join('sub', 'd.txt'): self.data,
+        }
+        for name, data in files.items():
+            with open(os.path.join(tmpdir.name, name), 'w', encoding='utf-8') as fp:
+                fp.write(data)
+
+        return tmpdir.name
+
+    def test_check(self):
+        tmpdir = self._create_tree()
+        for jobs in ('1', '2'):
+            args = sys.executable, '-m', 'kim_edn.tool', '--check', '--jobs', jobs, tmpdir
+            process = subprocess.run(args, capture_output=True, text=True)
+
+            self.assertEqual(process.returncode, 1)
+            self.assertEqual(process.stdout.splitlines(), [
+                f'{os.path.join(tmpdir, "a.edn")}: ok',
+                f'{os.path.join(tmpdir, "b.edn")}: ok',
+            ])
+            self.assertEqual(process.stderr.splitlines(), [
+                f'{os.path.join(tmpdir, "sub", "c.edn")}: Expecting property name '
+                'enclosed in double quotes: line 1 column 2 (char 1)',
+            ])
+
+        with open(os.path.join(tmpdir, 'a.edn'), 'r', encoding='utf-8', newline='') as fp:
+            self.assertEqual(fp.read(), self.data)
+
+    def test_in_place(self):
+        tmpdir = self._create_tree()
+        missing = os.path.join(tmpdir, 'missing.edn')
+        args = (sys.executable, '-m', 'kim_edn.tool', '--in-place',
+                os.path.join(tmpdir, '*.edn'), missing)
+        process = subprocess.run(args, capture_output=True, text=True)
+
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(process.stdout.splitlines(), [
+            f'{os.path.join(tmpdir, "a.edn")}: reformatted',
+            f'{os.path.join(tmpdir, "b.edn")}: unchanged',
+        ])
+        self.assertTrue(process.stderr.startswith(f'{missing}: '))
+
+        for name in ('a.edn', 'b.edn'):
+            with open(os.path.join(tmpdir, name), 'r', encoding='utf-8') as fp:
+                self.assertEqual(fp.read(), self.expect)
+
+    def test_in_place_replace(self):
+        tmpdir = self._create_tree()
+        path = os.path.join(tmpdir, 'a.edn')
+        os.chmod(path, 0o640)
+        args = sys.executable, '-m', 'kim_edn.tool', '--in-place', path
+        process = subprocess.run(args, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.stdout, f'{path}: reformatted\n')
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        self.assertEqual(sorted(os.listdir(tmpdir)), ['a.edn', 'b.edn', 'sub'])
+
+    def test_check_edn_lines_separators(self):
+        # U+2028 and the other line separators of str.splitlines are only
+        # characters of the string, as when reading stdin
+        data = '{"a" "x\u2028y"}\n["\u2029" "\x85"]\n'
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'lines.edn')
+        with open(path, 'w', encoding='utf-8', newline='') as fp:
+            fp.write(data)
+
+        args = sys.executable, '-m', 'kim_edn.tool', '--edn-lines'
+        process = subprocess.run(args + (path,), capture_output=True, text=True)
+        self.assertEqual(process.returncode, 0)
+
+        process = subprocess.run(args + ('--check', path), capture_output=True, text=True)
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, f'{path}: ok\n')
+
+    def test_many_files_without_batch_flag(self):
+        args = sys.executable, '-m', 'kim_edn.tool', 'a.edn', 'b.edn', 'c.edn'
+        process = subprocess.run(args, capture_output=True, text=True)
+
+        self.assertEqual(process.returncode, 2)
+        self.assertIn('--check or --in-place', process.stderr)
+
+    def test_reindent(self):
+        args = sys.executable, '-m', 'kim_edn.tool', '--reindent'
+        process = subprocess.run(args, input=self.data, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, self.expect)
+        self.assertEqual(process.stderr, '')
+
+    def test_minify(self):
+        input_ = '{"a": [1.50, 2E3] ; numbers\n}'
+        for flags, expect in ((('--minify', ), '{"a" [1.50 2E3] ; numbers\n}\n\n'),
+                              (('--minify', '--strip-comments'), '{"a" [1.50 2E3]}\n\n')):
+            args = (sys.executable, '-m', 'kim_edn.tool') + flags
+            process = subprocess.run(args, input=input_, capture_output=True, text=True, check=True)
+
+            self.assertEqual(process.returncode, 0)
+            self.assertEqual(process.stdout, expect)
+            self.assertEqual(process.stderr, '')
+
+    def test_to_json(self):
+        args = sys.executable, '-m', 'kim_edn.tool', '--to-json', '--indent', '4'
+        process = subprocess.run(args, input=self.data, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, json.dumps(self.loads(self.data), indent=4) + '\n')
+        self.assertEqual(process.stderr, '')
+
+        args = sys.executable, '-m', 'kim_edn.tool', '--to-json', '--edn-lines', '--sort-keys'
+        process = subprocess.run(args, input=self.ednlines_raw, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, self.ednlines_raw.replace(',', ', ').replace(':', ': '))
+        self.assertEqual(process.stderr, '')
+
+    def test_from_json(self):
+        data = json.dumps(self.loads(self.data))
+        args = sys.executable, '-m', 'kim_edn.tool', '--from-json', '--indent', '4'
+        process = subprocess.run(args, input=data, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, self.expect[:-1])
+        self.assertEqual(process.stderr, '')
+
+        args = sys.executable, '-m', 'kim_edn.tool', '--from-json', '--edn-lines'
+        process = subprocess.run(args, input=self.ednlines_raw, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, self.ednlines_raw.replace(',', ' ').replace(':', ' '))
+        self.assertEqual(process.stderr, '')
+
+        args = sys.executable, '-m', 'kim_edn.tool', '--from-json'
+        process = subprocess.run(args, input='{"a": null}', capture_output=True, text=True)
+
+        self.assertEqual(process.returncode, 1)
+        self.assertIn('not KIM-EDN serializable', process.stderr)
+
     def test_help_flag(self):
         args = sys.executable, '-m', 'kim_edn.tool', '-h'
         process = subprocess.run(args, capture_output=True, text=True, check=True)
@@ -174,6 +363,33 @@ class TestTool:
         self.assertEqual(process.returncode, 0)
         self.assertTrue(process.stdout.startswith('usage: '))
         self.assertEqual(process.stderr, '')
+        self.assertIn('--to-json', process.stdout)
+        self.assertIn('--from-json', process.stdout)
+
+    def test_convert_file_named_like_flag(self):
+        # The conversion flag may follow the files, which may have any name
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        infile = os.path.join(tmpdir.name, 'to-json')
+        with open(infile, 'w', encoding='utf-8') as fp:
+            fp.write(self.data)
+
+        args = sys.executable, '-m', 'kim_edn.tool', infile, '--to-json'
+        process = subprocess.run(args, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.stdout, json.dumps(self.loads(self.data)) + '\n')
+        self.assertEqual(process.stderr, '')
+
+        args = sys.executable, '-m', 'kim_edn.tool', infile
+        process = subprocess.run(args, capture_output=True, text=True, check=True)
+
+        self.assertEqual(process.stdout, self.expect)
+
+        args = sys.executable, '-m', 'kim_edn.tool', '--to-json', '--edn-lines', '--indent', '2'
+        process = subprocess.run(args, input=self.ednlines_raw, capture_output=True, text=True)
+
+        self.assertEqual(process.returncode, 2)
+        self.assertIn('cannot be used', process.stderr)
 
     def test_sort_keys_flag(self):
         infile = self._create_infile()